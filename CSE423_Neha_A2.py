@@ -1,382 +1,973 @@
-from OpenGL.GL import *
-from OpenGL.GLUT import *
-from OpenGL.GLU import *
-import random
-import time
-import math
-
-class GameWindow:
-    def __init__(self, width, height):
-        self.width = width
-        self.height = height
-        self.title = "Diamond Collector"
-        self.init_window()
-
-    def init_window(self):
-        glutInit()
-        glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB)
-        glutInitWindowSize(self.width, self.height)
-        glutInitWindowPosition(100, 100)
-        glutCreateWindow(self.title.encode())
-        glClearColor(0.0, 0.0, 0.0, 0.0)
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        gluOrtho2D(0, self.width, 0, self.height)
-
-class LineDrawer:
-    @staticmethod
-    def get_zone(x1, y1, x2, y2):
-        dx = x2 - x1
-        dy = y2 - y1
-        if abs(dx) >= abs(dy):
-            if dx >= 0 and dy >= 0: return 0
-            if dx >= 0 and dy < 0: return 7
-            if dx < 0 and dy >= 0: return 3
-            return 4
-        else:
-            if dx >= 0 and dy >= 0: return 1
-            if dx >= 0 and dy < 0: return 6
-            if dx < 0 and dy >= 0: return 2
-            return 5
-
-    @staticmethod
-    def to_zone0(x, y, zone):
-        if zone == 0: return x, y
-        if zone == 1: return y, x
-        if zone == 2: return y, -x
-        if zone == 3: return -x, y
-        if zone == 4: return -x, -y
-        if zone == 5: return -y, -x
-        if zone == 6: return -y, x
-        return x, -y
-
-    @staticmethod
-    def from_zone0(x, y, zone):
-        if zone == 0: return x, y
-        if zone == 1: return y, x
-        if zone == 2: return -y, x
-        if zone == 3: return -x, y
-        if zone == 4: return -x, -y
-        if zone == 5: return -y, -x
-        if zone == 6: return y, -x
-        return x, -y
-
-    @staticmethod
-    def draw_zone0_line(x1, y1, x2, y2, zone):
-        dx = x2 - x1
-        dy = y2 - y1
-        d = 2 * dy - dx
-        inc_e = 2 * dy
-        inc_ne = 2 * (dy - dx)
-        
-        x, y = x1, y1
-        while x <= x2:
-            px, py = LineDrawer.from_zone0(x, y, zone)
-            LineDrawer.plot_point(px, py)
-            if d <= 0:
-                d += inc_e
-            else:
-                d += inc_ne
-                y += 1
-            x += 1
-
-    @staticmethod
-    def plot_point(x, y):
-        glBegin(GL_POINTS)
-        glVertex2f(x, y)
-        glEnd()
-
-    @staticmethod
-    def draw(x1, y1, x2, y2):
-        zone = LineDrawer.get_zone(x1, y1, x2, y2)
-        x1z, y1z = LineDrawer.to_zone0(x1, y1, zone)
-        x2z, y2z = LineDrawer.to_zone0(x2, y2, zone)
-
-        if x1z > x2z:
-            x1z, x2z = x2z, x1z
-            y1z, y2z = y2z, y1z
-        LineDrawer.draw_zone0_line(x1z, y1z, x2z, y2z, zone)
-
-class Diamond:
-    def __init__(self, x, y, size):
-        self.x = x
-        self.y = y
-        self.size = size
-        self.color = (random.random(), random.random(), random.random())
-    
-    def get_edges(self):
-        half = self.size / 2
-        return [(self.x, self.y + half),  # Top
-            (self.x + half, self.y),     # Right
-            (self.x, self.y - half),     # Bottom
-            (self.x - half, self.y)]      # Left
-    
-    def move(self, speed, dt):
-        self.y -= speed * dt
-    
-    def is_out(self):
-        return self.y + self.size/2 < 0
-    
-    def draw(self):
-        edges = self.get_edges()
-        for i in range(4):
-            x1, y1 = edges[i]
-            x2, y2 = edges[(i+1)%4]
-            glColor3f(*self.color)
-            LineDrawer.draw(x1, y1, x2, y2)
-
-class Catcher:
-    def __init__(self, x, y, width, height, slope):
-        self.x = x
-        self.y = y
-        self.width = width
-        self.height = height
-        self.slope = slope
-        self.color = (1.0, 1.0, 1.0)
-    
-    def get_corners(self):
-        return [(self.x - self.width/2, self.y),                     # Bottom-left
-            (self.x - self.width/2 + self.slope, self.y + self.height), # Top-left
-            (self.x + self.width/2 + self.slope, self.y + self.height), # Top-right
-            (self.x + self.width/2, self.y)]                      # Bottom-right 
-    
-    def move(self, direction, speed, dt, window_width):
-        move_dist = speed * dt * direction
-        new_x = self.x + move_dist
-        
-        min_x = self.width/2
-        max_x = window_width - self.width/2 - self.slope
-        
-        if min_x <= new_x <= max_x:
-            self.x = new_x
-    
-    def draw(self):
-        corners = self.get_corners()
-        glColor3f(*self.color)
-        for i in range(4):
-            x1, y1 = corners[i]
-            x2, y2 = corners[(i+1)%4]
-            LineDrawer.draw(x1, y1, x2, y2)
-
-class GameButton:
-    def __init__(self, x, y, size, color):
-        self.x = x
-        self.y = y
-        self.size = size
-        self.color = color
-    
-    def contains(self, px, py):
-        return (self.x <= px <= self.x + self.size and 
-                self.y <= py <= self.y + self.size)
-
-class RestartButton(GameButton):
-    def draw(self):
-        glColor3f(*self.color)
-        # Draw triangle arrow
-        LineDrawer.draw(self.x, self.y + self.size/2, 
-                        self.x + self.size, self.y + self.size)
-        LineDrawer.draw(self.x + self.size, self.y + self.size,
-                        self.x + self.size, self.y)
-        LineDrawer.draw(self.x + self.size, self.y,
-                        self.x, self.y + self.size/2)
-
-class PlayPauseButton(GameButton):
-    def draw(self, is_paused):
-        glColor3f(*self.color)
-        if is_paused:
-            # Play triangle
-            LineDrawer.draw(self.x, self.y,
-                           self.x, self.y + self.size)
-            LineDrawer.draw(self.x, self.y + self.size,
-                           self.x + self.size, self.y + self.size/2)
-            LineDrawer.draw(self.x + self.size, self.y + self.size/2,
-                           self.x, self.y)
-        else:
-            # Pause bars
-            bar_width = self.size / 4
-            left = self.x + bar_width
-            right = self.x + 3 * bar_width
-            LineDrawer.draw(left, self.y, left, self.y + self.size)
-            LineDrawer.draw(right, self.y, right, self.y + self.size)
-
-class QuitButton(GameButton):
-    def draw(self):
-        glColor3f(*self.color)
-        LineDrawer.draw(self.x, self.y, self.x + self.size, self.y + self.size)
-        LineDrawer.draw(self.x, self.y + self.size, self.x + self.size, self.y)
-
-class DiamondGame:
-    def __init__(self):
-        self.width = 800
-        self.height = 600
-        self.window = GameWindow(self.width, self.height)
-        
-        # Game objects
-        catcher_width = 120
-        catcher_height = 25
-        self.catcher = Catcher(
-            x=self.width//2,
-            y=20,
-            width=catcher_width,
-            height=catcher_height,
-            slope=20
-        )
-        
-        # Game state
-        self.score = 0
-        self.game_over = False
-        self.paused = False
-        self.diamond_speed = 100
-        self.speed_increase = 10
-        self.catcher_speed = 300
-        self.diamond = None
-        
-        # Buttons
-        btn_size = 30
-        btn_margin = 10
-        self.restart_btn = RestartButton(
-            btn_margin, self.height - btn_margin - btn_size, 
-            btn_size, (0.0, 1.0, 1.0)
-        )
-        self.play_pause_btn = PlayPauseButton(
-            self.width//2 - btn_size//2, self.height - btn_margin - btn_size,
-            btn_size, (1.0, 0.75, 0.0)
-        )
-        self.quit_btn = QuitButton(
-            self.width - btn_margin - btn_size, self.height - btn_margin - btn_size,
-            btn_size, (1.0, 0.0, 0.0)
-        )
-        
-        # Input handling
-        self.key_state = {'left': False, 'right': False}
-        self.last_time = time.time()
-        
-        self.spawn_diamond()
-        self.setup_callbacks()
-    
-    
-    def spawn_diamond(self):
-        size = 30
-        self.diamond = Diamond(
-            x=random.randint(size, self.width - size),
-            y=self.height - size,
-            size=size
-        )
-    
-    def handle_collision(self):
-        if not self.diamond:
-            return False
-            
-        diamond_edges = self.diamond.get_edges()
-        catcher_edges = self.catcher.get_corners()
-        
-        # Simple AABB collision check
-        diamond_min_x = min(p[0] for p in diamond_edges)
-        diamond_max_x = max(p[0] for p in diamond_edges)
-        diamond_min_y = min(p[1] for p in diamond_edges)
-        
-        catcher_min_x = min(p[0] for p in catcher_edges)
-        catcher_max_x = max(p[0] for p in catcher_edges)
-        catcher_max_y = max(p[1] for p in catcher_edges)
-        
-        return (diamond_max_x >= catcher_min_x and
-                diamond_min_x <= catcher_max_x and
-                diamond_min_y <= catcher_max_y)
-    
-    def update(self):
-        current_time = time.time()
-        delta_time = current_time - self.last_time
-        self.last_time = current_time
-        
-        if self.paused or self.game_over:
-            return
-        
-        # Move catcher
-        direction = 0
-        if self.key_state['left']: direction = -1
-        if self.key_state['right']: direction = 1
-        self.catcher.move(direction, self.catcher_speed, delta_time, self.width)
-        
-        # Move diamond
-        if self.diamond:
-            self.diamond.move(self.diamond_speed, delta_time)
-            
-            if self.handle_collision():
-                self.score += 1
-                print(f"Caught! Score: {self.score}")
-                self.diamond_speed += self.speed_increase
-                self.spawn_diamond()
-            elif self.diamond.is_out():
-                self.game_over = True
-                print(f"Game Over! Final Score: {self.score}")
-                self.diamond = None
-        else:
-            self.spawn_diamond()
-        
-        glutPostRedisplay()
-    
-    def display(self):
-        glClear(GL_COLOR_BUFFER_BIT)
-        
-        # Draw buttons
-        self.restart_btn.draw()
-        self.play_pause_btn.draw(self.paused)
-        self.quit_btn.draw()
-        
-        # Draw game objects
-        if self.diamond:
-            self.diamond.draw()
-        self.catcher.draw()
-        
-        glutSwapBuffers()
-    
-    def keyboard(self, key, x, y):
-        if key == b' ':
-            self.paused = not self.paused
-    
-    def special_keys(self, key, x, y):
-        if key == GLUT_KEY_LEFT:
-            self.key_state['left'] = True
-        elif key == GLUT_KEY_RIGHT:
-            self.key_state['right'] = True
-    
-    def special_keys_up(self, key, x, y):
-        if key == GLUT_KEY_LEFT:
-            self.key_state['left'] = False
-        elif key == GLUT_KEY_RIGHT:
-            self.key_state['right'] = False
-    
-    def mouse_click(self, button, state, x, y):
-        if button == GLUT_LEFT_BUTTON and state == GLUT_DOWN:
-            ogl_y = self.height - y
-            if self.restart_btn.contains(x, ogl_y):
-                self.restart_game()
-            elif self.play_pause_btn.contains(x, ogl_y):
-                self.paused = not self.paused
-            elif self.quit_btn.contains(x, ogl_y):
-                print("Thanks for playing!")
-                glutLeaveMainLoop()
-    
-    def restart_game(self):
-        self.score = 0
-        self.diamond_speed = 100
-        self.game_over = False
-        self.paused = False
-        self.catcher.x = self.width // 2
-        self.spawn_diamond()
-        print("Game restarted")
-
-    def setup_callbacks(self):
-        glutDisplayFunc(self.display)
-        glutIdleFunc(self.update)
-        glutKeyboardFunc(self.keyboard)
-        glutSpecialFunc(self.special_keys)
-        glutSpecialUpFunc(self.special_keys_up)
-        glutMouseFunc(self.mouse_click)
-
-def main():
-    game = DiamondGame()
-    glutMainLoop()
-
-if __name__ == "__main__":
-    main()
+from OpenGL.GL import *
+from OpenGL.GLUT import *
+from OpenGL.GLU import *
+import random
+import math
+import sys
+from collections import OrderedDict
+import numpy as np
+from frame_profiler import profiler
+from frame_pacer import FramePacer
+
+class GameWindow:
+    def __init__(self, width, height, create=True):
+        self.width = width
+        self.height = height
+        self.title = "Diamond Collector"
+        # create=False only sets up the view, for a context made elsewhere (offscreen)
+        if create:
+            self.init_window()
+        self.init_view()
+
+    def init_window(self):
+        glutInit()
+        glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB)
+        glutInitWindowSize(self.width, self.height)
+        glutInitWindowPosition(100, 100)
+        glutCreateWindow(self.title.encode())
+
+    def init_view(self):
+        glClearColor(0.0, 0.0, 0.0, 0.0)
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluOrtho2D(0, self.width, 0, self.height)
+
+class PointBatch:
+    """Collects rasterized pixels and their colours so a frame is submitted in one draw call."""
+    def __init__(self, capacity=4096):
+        self.points = np.zeros((capacity, 2), dtype=np.int32)
+        self.colors = np.zeros((capacity, 3), dtype=np.float32)
+        self.count = 0
+        self.color = (1.0, 1.0, 1.0)
+
+    def set_color(self, color):
+        self.color = color
+
+    def reserve(self, extra):
+        needed = self.count + extra
+        if needed <= len(self.points):
+            return
+        capacity = max(needed, 2 * len(self.points))
+        points = np.zeros((capacity, 2), dtype=np.int32)
+        colors = np.zeros((capacity, 3), dtype=np.float32)
+        points[:self.count] = self.points[:self.count]
+        colors[:self.count] = self.colors[:self.count]
+        self.points, self.colors = points, colors
+
+    def add_pixels(self, pixels):
+        n = len(pixels)
+        self.reserve(n)
+        self.points[self.count:self.count + n] = pixels
+        self.colors[self.count:self.count + n] = self.color
+        self.count += n
+
+    def add_colored_pixels(self, pixels, colors):
+        # one RGB row per pixel instead of the current colour
+        n = len(pixels)
+        self.reserve(n)
+        self.points[self.count:self.count + n] = pixels
+        self.colors[self.count:self.count + n] = colors
+        self.count += n
+
+    def flush(self):
+        if self.count:
+            glPushMatrix()
+            glTranslatef(0.5, 0.5, 0)  # integer pixels -> pixel centres
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glVertexPointer(2, GL_INT, 0, self.points[:self.count])
+            glColorPointer(3, GL_FLOAT, 0, self.colors[:self.count])
+            glDrawArrays(GL_POINTS, 0, self.count)
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+            glPopMatrix()
+        self.count = 0
+
+class FramebufferSink:
+    """Software framebuffer: rasterized pixels are written straight into a uint8 image.
+
+    Same interface as PointBatch, but needs no GL until flush(), which blits the whole
+    frame with one glDrawPixels. Row 0 is the bottom row, as in the GL window.
+    """
+    def __init__(self, width, height, background=(0.0, 0.0, 0.0)):
+        self.width = width
+        self.height = height
+        self.background = self.to_bytes(background)
+        self.pixels = np.empty((height, width, 3), dtype=np.uint8)
+        self.pixels[:] = self.background
+        self.color = self.to_bytes((1.0, 1.0, 1.0))
+
+    @staticmethod
+    def to_bytes(color):
+        # GL's float -> unsigned normalized conversion
+        return np.round(np.clip(color, 0.0, 1.0) * 255).astype(np.uint8)
+
+    def set_color(self, color):
+        self.color = self.to_bytes(color)
+
+    def add_pixels(self, pixels):
+        pixels = np.asarray(pixels)
+        x, y = pixels[:, 0], pixels[:, 1]
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        self.pixels[y[inside], x[inside]] = self.color
+
+    def add_colored_pixels(self, pixels, colors):
+        # one RGB row per pixel instead of the current colour
+        pixels = np.asarray(pixels)
+        x, y = pixels[:, 0], pixels[:, 1]
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        self.pixels[y[inside], x[inside]] = self.to_bytes(np.asarray(colors)[inside])
+
+    def clear(self):
+        self.pixels[:] = self.background
+
+    def snapshot(self):
+        """The frame as a (height, width, 3) image, top row first like a screenshot; starts a new frame."""
+        image = self.pixels[::-1].copy()
+        self.clear()
+        return image
+
+    def flush(self):
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glWindowPos2i(0, 0)   # window coordinates, whatever the projection
+        glDrawPixels(self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE, self.pixels)
+        self.clear()
+
+class LineDrawer:
+    sink = None  # PointBatch or FramebufferSink while batching; None plots every pixel immediately
+
+    # LRU of rasterized lines keyed on (x2-x1, y2-y1): the pixel pattern only depends on
+    # the endpoint delta, so a translated line reuses it offset from its start pixel
+    cache = OrderedDict()
+    cache_size = 256
+    cache_enabled = True
+    cache_hits = 0
+    cache_misses = 0
+    cache_evictions = 0
+
+    @staticmethod
+    def get_zone(x1, y1, x2, y2):
+        dx = x2 - x1
+        dy = y2 - y1
+        if abs(dx) >= abs(dy):
+            if dx >= 0 and dy >= 0: return 0
+            if dx >= 0 and dy < 0: return 7
+            if dx < 0 and dy >= 0: return 3
+            return 4
+        else:
+            if dx >= 0 and dy >= 0: return 1
+            if dx >= 0 and dy < 0: return 6
+            if dx < 0 and dy >= 0: return 2
+            return 5
+
+    @staticmethod
+    def to_zone0(x, y, zone):
+        if zone == 0: return x, y
+        if zone == 1: return y, x
+        if zone == 2: return y, -x
+        if zone == 3: return -x, y
+        if zone == 4: return -x, -y
+        if zone == 5: return -y, -x
+        if zone == 6: return -y, x
+        return x, -y
+
+    @staticmethod
+    def from_zone0(x, y, zone):
+        if zone == 0: return x, y
+        if zone == 1: return y, x
+        if zone == 2: return -y, x
+        if zone == 3: return -x, y
+        if zone == 4: return -x, -y
+        if zone == 5: return -y, -x
+        if zone == 6: return y, -x
+        return x, -y
+
+    @staticmethod
+    def draw_zone0_line(x1, y1, x2, y2, zone):
+        dx = x2 - x1
+        dy = y2 - y1
+        d = 2 * dy - dx
+        inc_e = 2 * dy
+        inc_ne = 2 * (dy - dx)
+        
+        x, y = x1, y1
+        while x <= x2:
+            px, py = LineDrawer.from_zone0(x, y, zone)
+            LineDrawer.plot_point(px, py)
+            if d <= 0:
+                d += inc_e
+            else:
+                d += inc_ne
+                y += 1
+            x += 1
+
+    @staticmethod
+    def zone0_pixels(x1, y1, x2, y2, zone):
+        # Same midpoint walk as draw_zone0_line, collected instead of plotted
+        dx = x2 - x1
+        dy = y2 - y1
+        d = 2 * dy - dx
+        inc_e = 2 * dy
+        inc_ne = 2 * (dy - dx)
+
+        pixels = []
+        x, y = x1, y1
+        while x <= x2:
+            pixels.append(LineDrawer.from_zone0(x, y, zone))
+            if d <= 0:
+                d += inc_e
+            else:
+                d += inc_ne
+                y += 1
+            x += 1
+        return pixels
+
+    @staticmethod
+    def rasterize(x1, y1, x2, y2):
+        """Integer pixels of a line, exactly those plot_point would light."""
+        zone = LineDrawer.get_zone(x1, y1, x2, y2)
+        x1z, y1z = LineDrawer.to_zone0(x1, y1, zone)
+        x2z, y2z = LineDrawer.to_zone0(x2, y2, zone)
+
+        if x1z > x2z:
+            x1z, x2z = x2z, x1z
+            y1z, y2z = y2z, y1z
+        points = LineDrawer.zone0_pixels(x1z, y1z, x2z, y2z, zone)
+        return np.floor(np.array(points, dtype=np.float64)).astype(np.int32)
+
+    # from_zone0 as a matrix per zone: (px, py) = M @ (x, y); to_zone0 is its transpose
+    ZONE_MATRICES = np.array([[[1, 0], [0, 1]], [[0, 1], [1, 0]], [[0, -1], [1, 0]], [[-1, 0], [0, 1]],
+                              [[-1, 0], [0, -1]], [[0, -1], [-1, 0]], [[0, 1], [-1, 0]], [[1, 0], [0, -1]]])
+
+    @staticmethod
+    def get_zones(dx, dy):
+        """get_zone for arrays of endpoint deltas."""
+        shallow = np.abs(dx) >= np.abs(dy)
+        right, up = dx >= 0, dy >= 0
+        return np.where(shallow, np.where(right, np.where(up, 0, 7), np.where(up, 3, 4)),
+                                 np.where(right, np.where(up, 1, 6), np.where(up, 2, 5)))
+
+    @staticmethod
+    def rasterize_lines(endpoints):
+        """Pixels of many lines at once from an (N, 4) array of x1, y1, x2, y2.
+
+        Returns (pixels, starts): line i owns pixels[starts[i]:starts[i+1]], in the order
+        rasterize() walks it. The midpoint decisions are evaluated in closed form,
+        y_k = ceil((2*dy*k - dx) / (2*dx)) in zone 0, which is exact for integer
+        endpoints; fractional ones can differ from the incremental walk by float rounding.
+        """
+        lines = np.asarray(endpoints, dtype=np.float64).reshape(-1, 4)
+        zones = LineDrawer.get_zones(lines[:, 2] - lines[:, 0], lines[:, 3] - lines[:, 1])
+        m = LineDrawer.ZONE_MATRICES[zones]
+        # into zone 0 (transpose of from_zone0), then walk from the smaller x
+        p1 = np.einsum('nji,nj->ni', m, lines[:, 0:2])
+        p2 = np.einsum('nji,nj->ni', m, lines[:, 2:4])
+        swap = p1[:, 0] > p2[:, 0]
+        p1[swap], p2[swap] = p2[swap], p1[swap]
+        dx = p2[:, 0] - p1[:, 0]
+        dy = p2[:, 1] - p1[:, 1]
+
+        # ragged arange: step k of every line in one flat array
+        counts = np.floor(dx).astype(np.int64) + 1
+        starts = np.zeros(len(lines) + 1, dtype=np.int64)
+        np.cumsum(counts, out=starts[1:])
+        line = np.repeat(np.arange(len(lines)), counts)
+        k = np.arange(starts[-1]) - starts[line]
+
+        # y_k per line from the midpoint decisions; a zero-length line is its start pixel
+        y = -np.floor((dx[line] - 2*dy[line]*k) / np.maximum(2*dx, 1)[line])
+        zx = p1[line, 0] + k
+        zy = p1[line, 1] + y
+        # back out of zone 0 with from_zone0
+        m = m[line]
+        pixels = np.empty((len(k), 2), dtype=np.int32)
+        pixels[:, 0] = np.floor(m[:, 0, 0]*zx + m[:, 0, 1]*zy)
+        pixels[:, 1] = np.floor(m[:, 1, 0]*zx + m[:, 1, 1]*zy)
+        return pixels, starts
+
+    @staticmethod
+    def pixels(x1, y1, x2, y2):
+        """Pixels of a line, served from the LRU cache when the same delta was seen before."""
+        if not LineDrawer.cache_enabled:
+            return LineDrawer.rasterize(x1, y1, x2, y2)
+        key = (round(x2 - x1, 6), round(y2 - y1, 6))
+        offsets = LineDrawer.cache.get(key)
+        if offsets is None:
+            LineDrawer.cache_misses += 1
+            pixels = LineDrawer.rasterize(x1, y1, x2, y2)
+            LineDrawer.cache[key] = pixels - pixels[0]
+            if len(LineDrawer.cache) > LineDrawer.cache_size:
+                LineDrawer.cache.popitem(last=False)
+                LineDrawer.cache_evictions += 1
+            return pixels
+        LineDrawer.cache_hits += 1
+        LineDrawer.cache.move_to_end(key)
+        # the walk always starts on the first endpoint's pixel
+        return offsets + (math.floor(x1), math.floor(y1))
+
+    @staticmethod
+    def cache_stats():
+        return {'size': len(LineDrawer.cache), 'hits': LineDrawer.cache_hits,
+                'misses': LineDrawer.cache_misses, 'evictions': LineDrawer.cache_evictions}
+
+    @staticmethod
+    def clear_cache():
+        LineDrawer.cache.clear()
+        LineDrawer.cache_hits = LineDrawer.cache_misses = LineDrawer.cache_evictions = 0
+
+    @staticmethod
+    def set_color(color):
+        if LineDrawer.sink is not None:
+            LineDrawer.sink.set_color(color)
+        else:
+            glColor3f(*color)
+
+    @staticmethod
+    def plot_point(x, y):
+        glBegin(GL_POINTS)
+        glVertex2f(x, y)
+        glEnd()
+
+    @staticmethod
+    def draw(x1, y1, x2, y2):
+        if LineDrawer.sink is not None:
+            LineDrawer.sink.add_pixels(LineDrawer.pixels(x1, y1, x2, y2))
+            return
+        zone = LineDrawer.get_zone(x1, y1, x2, y2)
+        x1z, y1z = LineDrawer.to_zone0(x1, y1, zone)
+        x2z, y2z = LineDrawer.to_zone0(x2, y2, zone)
+
+        if x1z > x2z:
+            x1z, x2z = x2z, x1z
+            y1z, y2z = y2z, y1z
+        LineDrawer.draw_zone0_line(x1z, y1z, x2z, y2z, zone)
+
+    @staticmethod
+    def draw_lines(endpoints):
+        """Draws every row of an (N, 4) endpoint array, rasterized in one vectorized pass when batching."""
+        if LineDrawer.sink is not None:
+            LineDrawer.sink.add_pixels(LineDrawer.rasterize_lines(endpoints)[0])
+            return
+        for x1, y1, x2, y2 in np.asarray(endpoints).reshape(-1, 4):
+            LineDrawer.draw(x1, y1, x2, y2)
+
+    @staticmethod
+    def draw_polyline(points, closed=True):
+        count = len(points) if closed else len(points) - 1
+        segments = [(points[i], points[(i+1) % len(points)]) for i in range(count)]
+        if LineDrawer.sink is not None:
+            # whole outline goes into the sink as one block
+            LineDrawer.sink.add_pixels(np.concatenate(
+                [LineDrawer.pixels(x1, y1, x2, y2) for (x1, y1), (x2, y2) in segments]))
+            return
+        for (x1, y1), (x2, y2) in segments:
+            LineDrawer.draw(x1, y1, x2, y2)
+
+class Diamond:
+    def __init__(self, x, y, size):
+        self.x = x
+        self.y = y
+        self.size = size
+        self.color = (random.random(), random.random(), random.random())
+    
+    def get_edges(self):
+        half = self.size / 2
+        return [(self.x, self.y + half),  # Top
+            (self.x + half, self.y),     # Right
+            (self.x, self.y - half),     # Bottom
+            (self.x - half, self.y)]      # Left
+    
+    def move(self, speed, dt):
+        self.y -= speed * dt
+    
+    def is_out(self):
+        return self.y + self.size/2 < 0
+    
+    def draw(self):
+        LineDrawer.set_color(self.color)
+        LineDrawer.draw_polyline(self.get_edges())
+
+class DiamondField:
+    """Struct-of-arrays store for many falling diamonds, live ones packed into [0, count).
+
+    Each diamond keeps its AABB (min_x, max_x, min_y, max_y), shifted in move() along
+    with y, so collision and out-of-window tests never rebuild the edge list.
+    """
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.sizes = np.zeros(capacity)
+        self.speeds = np.zeros(capacity)
+        self.colors = np.zeros((capacity, 3))
+        self.aabb = np.zeros((capacity, 4))
+
+    def grow(self):
+        capacity = 2 * len(self.x)
+        for name in ('x', 'y', 'sizes', 'speeds', 'colors', 'aabb'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, x, y, size, speed, color):
+        if self.count == len(self.x):
+            self.grow()
+        i = self.count
+        half = size / 2
+        self.x[i], self.y[i], self.sizes[i], self.speeds[i] = x, y, size, speed
+        self.colors[i] = color
+        self.aabb[i] = (x - half, x + half, y - half, y + half)
+        self.count += 1
+        return i
+
+    def remove(self, indices):
+        # bulk compaction; survivors keep their order
+        keep = np.ones(self.count, dtype=bool)
+        keep[indices] = False
+        n = int(keep.sum())
+        for name in ('x', 'y', 'sizes', 'speeds', 'colors', 'aabb'):
+            arr = getattr(self, name)
+            arr[:n] = arr[:self.count][keep]
+        self.count = n
+
+    def clear(self):
+        self.count = 0
+
+    def move(self, dt):
+        n = self.count
+        dy = self.speeds[:n] * dt
+        self.y[:n] -= dy
+        self.aabb[:n, 2:] -= dy[:, None]
+
+    def is_out(self):
+        """Mask of diamonds that fell below the window (Diamond.is_out for all)."""
+        return self.aabb[:self.count, 3] < 0
+
+    def collide(self, bounds):
+        """Indices of diamonds touching a catcher AABB (min_x, max_x, min_y, max_y).
+
+        Same test as DiamondGame.handle_collision. Diamonds are swept in order of their
+        lowest point: everything past the catcher's top is cut off with one searchsorted,
+        and only the rest is tested on x.
+        """
+        min_x, max_x, _, max_y = bounds
+        box = self.aabb[:self.count]
+        order = np.argsort(box[:, 2], kind='stable')
+        reach = np.searchsorted(box[order, 2], max_y, side='right')
+        candidates = order[:reach]
+        hit = (box[candidates, 1] >= min_x) & (box[candidates, 0] <= max_x)
+        return np.sort(candidates[hit])
+
+    def edges(self):
+        """(4 * count, 4) endpoints of every outline, top-right-bottom-left like Diamond.get_edges."""
+        n = self.count
+        x, y, half = self.x[:n], self.y[:n], self.sizes[:n] / 2
+        corners = np.stack([np.stack((x, y + half), axis=1), np.stack((x + half, y), axis=1),
+                            np.stack((x, y - half), axis=1), np.stack((x - half, y), axis=1)], axis=1)
+        return np.concatenate((corners, np.roll(corners, -1, axis=1)), axis=2).reshape(-1, 4)
+
+    def draw(self):
+        if not self.count:
+            return
+        endpoints = self.edges()
+        if LineDrawer.sink is None:
+            for i in range(self.count):
+                LineDrawer.set_color(self.colors[i])
+                LineDrawer.draw_lines(endpoints[4*i:4*i + 4])
+            return
+        pixels, starts = LineDrawer.rasterize_lines(endpoints)
+        colors = np.repeat(np.repeat(self.colors[:self.count], 4, axis=0), np.diff(starts), axis=0)
+        LineDrawer.sink.add_colored_pixels(pixels, colors)
+
+class Catcher:
+    def __init__(self, x, y, width, height, slope):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.slope = slope
+        self.color = (1.0, 1.0, 1.0)
+    
+    def get_corners(self):
+        return [(self.x - self.width/2, self.y),                     # Bottom-left
+            (self.x - self.width/2 + self.slope, self.y + self.height), # Top-left
+            (self.x + self.width/2 + self.slope, self.y + self.height), # Top-right
+            (self.x + self.width/2, self.y)]                      # Bottom-right 
+
+    def get_aabb(self):
+        # (min_x, max_x, min_y, max_y) of the corners
+        xs, ys = zip(*self.get_corners())
+        return min(xs), max(xs), min(ys), max(ys)
+    
+    def move(self, direction, speed, dt, window_width):
+        move_dist = speed * dt * direction
+        new_x = self.x + move_dist
+        
+        min_x = self.width/2
+        max_x = window_width - self.width/2 - self.slope
+        
+        if min_x <= new_x <= max_x:
+            self.x = new_x
+    
+    def draw(self):
+        LineDrawer.set_color(self.color)
+        LineDrawer.draw_polyline(self.get_corners())
+
+class GameButton:
+    def __init__(self, x, y, size, color):
+        self.x = x
+        self.y = y
+        self.size = size
+        self.color = color
+    
+    def contains(self, px, py):
+        return (self.x <= px <= self.x + self.size and 
+                self.y <= py <= self.y + self.size)
+
+class RestartButton(GameButton):
+    def draw(self):
+        LineDrawer.set_color(self.color)
+        # Draw triangle arrow
+        LineDrawer.draw(self.x, self.y + self.size/2, 
+                        self.x + self.size, self.y + self.size)
+        LineDrawer.draw(self.x + self.size, self.y + self.size,
+                        self.x + self.size, self.y)
+        LineDrawer.draw(self.x + self.size, self.y,
+                        self.x, self.y + self.size/2)
+
+class PlayPauseButton(GameButton):
+    def draw(self, is_paused):
+        LineDrawer.set_color(self.color)
+        if is_paused:
+            # Play triangle
+            LineDrawer.draw(self.x, self.y,
+                           self.x, self.y + self.size)
+            LineDrawer.draw(self.x, self.y + self.size,
+                           self.x + self.size, self.y + self.size/2)
+            LineDrawer.draw(self.x + self.size, self.y + self.size/2,
+                           self.x, self.y)
+        else:
+            # Pause bars
+            bar_width = self.size / 4
+            left = self.x + bar_width
+            right = self.x + 3 * bar_width
+            LineDrawer.draw(left, self.y, left, self.y + self.size)
+            LineDrawer.draw(right, self.y, right, self.y + self.size)
+
+class QuitButton(GameButton):
+    def draw(self):
+        LineDrawer.set_color(self.color)
+        LineDrawer.draw(self.x, self.y, self.x + self.size, self.y + self.size)
+        LineDrawer.draw(self.x, self.y + self.size, self.x + self.size, self.y)
+
+class DiamondGame:
+    def __init__(self, batched=True, target_fps=60, report_fps=False, offscreen=False, software=False,
+                 max_diamonds=0):
+        self.width = 800
+        self.height = 600
+        # offscreen + software renders into numpy only and needs no GL context at all
+        self.window = None
+        if not (offscreen and software):
+            self.window = GameWindow(self.width, self.height, create=not offscreen)
+
+        # Batched mode rasterizes every line into one buffer, flushed once per frame;
+        # software mode rasterizes into a numpy framebuffer blitted once per frame
+        if software:
+            self.batch = FramebufferSink(self.width, self.height)
+        else:
+            self.batch = PointBatch() if batched else None
+        LineDrawer.sink = self.batch
+        
+        # Game objects
+        catcher_width = 120
+        catcher_height = 25
+        self.catcher = Catcher(
+            x=self.width//2,
+            y=20,
+            width=catcher_width,
+            height=catcher_height,
+            slope=20
+        )
+        
+        # Game state
+        self.score = 0
+        self.game_over = False
+        self.paused = False
+        self.diamond_speed = 100
+        self.speed_increase = 10
+        self.catcher_speed = 300
+        self.diamond = None
+
+        # Multi-diamond mode: up to max_diamonds fall at once from a DiamondField,
+        # spawned on a timer that speeds up with every catch; 0 keeps the single diamond
+        self.max_diamonds = max_diamonds
+        self.field = DiamondField(max_diamonds) if max_diamonds else None
+        self.start_spawn_interval = 0.8
+        self.min_spawn_interval = 0.02
+        self.spawn_interval = self.start_spawn_interval
+        self.spawn_timer = 0.0
+        
+        # Buttons
+        btn_size = 30
+        btn_margin = 10
+        self.restart_btn = RestartButton(
+            btn_margin, self.height - btn_margin - btn_size, 
+            btn_size, (0.0, 1.0, 1.0)
+        )
+        self.play_pause_btn = PlayPauseButton(
+            self.width//2 - btn_size//2, self.height - btn_margin - btn_size,
+            btn_size, (1.0, 0.75, 0.0)
+        )
+        self.quit_btn = QuitButton(
+            self.width - btn_margin - btn_size, self.height - btn_margin - btn_size,
+            btn_size, (1.0, 0.0, 0.0)
+        )
+        
+        # Input handling
+        self.key_state = {'left': False, 'right': False}
+
+        # Timer-driven frames on perf_counter; idle (paused/game over) frames are only
+        # drawn when input changes something
+        self.pacer = FramePacer(profiler.wrap("update", self.update), target_fps,
+                                is_idle=lambda: self.paused or self.game_over, report=report_fps)
+        
+        if self.field is None:
+            self.spawn_diamond()
+        if not offscreen:
+            self.setup_callbacks()
+            self.pacer.start()
+    
+    
+    def spawn_diamond(self):
+        size = 30
+        self.diamond = Diamond(
+            x=random.randint(size, self.width - size),
+            y=self.height - size,
+            size=size
+        )
+    
+    def spawn_into_field(self):
+        size = 30
+        self.field.spawn(random.randint(size, self.width - size), self.height - size, size,
+                         self.diamond_speed, (random.random(), random.random(), random.random()))
+
+    def update_field(self, delta_time):
+        self.spawn_timer -= delta_time
+        while self.spawn_timer <= 0:
+            if self.field.count < self.max_diamonds:
+                self.spawn_into_field()
+            self.spawn_timer += self.spawn_interval
+
+        self.field.move(delta_time)
+        caught = self.field.collide(self.catcher.get_aabb())
+        if len(caught):
+            self.score += len(caught)
+            print(f"Caught {len(caught)}! Score: {self.score}")
+            self.diamond_speed += self.speed_increase * len(caught)
+            self.spawn_interval = max(self.min_spawn_interval, self.spawn_interval * 0.97 ** len(caught))
+            self.field.remove(caught)
+        if self.field.is_out().any():
+            self.game_over = True
+            print(f"Game Over! Final Score: {self.score}")
+            self.field.clear()
+
+    def handle_collision(self):
+        if not self.diamond:
+            return False
+            
+        diamond_edges = self.diamond.get_edges()
+        catcher_edges = self.catcher.get_corners()
+        
+        # Simple AABB collision check
+        diamond_min_x = min(p[0] for p in diamond_edges)
+        diamond_max_x = max(p[0] for p in diamond_edges)
+        diamond_min_y = min(p[1] for p in diamond_edges)
+        
+        catcher_min_x = min(p[0] for p in catcher_edges)
+        catcher_max_x = max(p[0] for p in catcher_edges)
+        catcher_max_y = max(p[1] for p in catcher_edges)
+        
+        return (diamond_max_x >= catcher_min_x and
+                diamond_min_x <= catcher_max_x and
+                diamond_min_y <= catcher_max_y)
+    
+    def update(self, delta_time):
+        if self.paused or self.game_over:
+            return
+        
+        # Move catcher
+        direction = 0
+        if self.key_state['left']: direction = -1
+        if self.key_state['right']: direction = 1
+        self.catcher.move(direction, self.catcher_speed, delta_time, self.width)
+
+        if self.field is not None:
+            self.update_field(delta_time)
+            return
+        
+        # Move diamond
+        if self.diamond:
+            self.diamond.move(self.diamond_speed, delta_time)
+            
+            if self.handle_collision():
+                self.score += 1
+                print(f"Caught! Score: {self.score}")
+                self.diamond_speed += self.speed_increase
+                self.spawn_diamond()
+            elif self.diamond.is_out():
+                self.game_over = True
+                print(f"Game Over! Final Score: {self.score}")
+                self.diamond = None
+        else:
+            self.spawn_diamond()
+    
+    def draw_objects(self):
+        # Draw buttons
+        self.restart_btn.draw()
+        self.play_pause_btn.draw(self.paused)
+        self.quit_btn.draw()
+        
+        # Draw game objects
+        if self.diamond:
+            self.diamond.draw()
+        if self.field is not None:
+            self.field.draw()
+        self.catcher.draw()
+
+    def render_software(self):
+        """Frame drawn by the FramebufferSink alone, as a top-row-first (height, width, 3) uint8 image."""
+        self.draw_objects()
+        return self.batch.snapshot()
+
+    def display(self):
+        with profiler.phase("draw"):
+            glClear(GL_COLOR_BUFFER_BIT)
+            self.draw_objects()
+            if self.batch is not None:
+                self.batch.flush()
+            profiler.draw_overlay(self.width, self.height)
+        
+        with profiler.phase("swap"):
+            glutSwapBuffers()
+        profiler.end_frame()
+    
+    def keyboard(self, key, x, y):
+        if key == b' ':
+            self.paused = not self.paused
+    
+    def special_keys(self, key, x, y):
+        if key == GLUT_KEY_LEFT:
+            self.key_state['left'] = True
+        elif key == GLUT_KEY_RIGHT:
+            self.key_state['right'] = True
+    
+    def special_keys_up(self, key, x, y):
+        if key == GLUT_KEY_LEFT:
+            self.key_state['left'] = False
+        elif key == GLUT_KEY_RIGHT:
+            self.key_state['right'] = False
+    
+    def mouse_click(self, button, state, x, y):
+        if button == GLUT_LEFT_BUTTON and state == GLUT_DOWN:
+            ogl_y = self.height - y
+            if self.restart_btn.contains(x, ogl_y):
+                self.restart_game()
+            elif self.play_pause_btn.contains(x, ogl_y):
+                self.paused = not self.paused
+            elif self.quit_btn.contains(x, ogl_y):
+                print("Thanks for playing!")
+                glutLeaveMainLoop()
+    
+    def restart_game(self):
+        self.score = 0
+        self.diamond_speed = 100
+        self.game_over = False
+        self.paused = False
+        self.catcher.x = self.width // 2
+        if self.field is not None:
+            self.field.clear()
+            self.spawn_interval = self.start_spawn_interval
+            self.spawn_timer = 0.0
+        else:
+            self.spawn_diamond()
+        print("Game restarted")
+
+    def setup_callbacks(self):
+        glutDisplayFunc(self.pacer.wrap_display(self.display))
+        glutKeyboardFunc(self.pacer.wrap_input(self.keyboard))
+        glutSpecialFunc(self.pacer.wrap_input(self.special_keys))
+        glutSpecialUpFunc(self.pacer.wrap_input(self.special_keys_up))
+        glutMouseFunc(self.pacer.wrap_input(self.mouse_click))
+
+def check_batched_rasterizer(trials=2000, seed=423):
+    """Pixel-for-pixel comparison of the batched path against per-pixel plot_point.
+
+    Returns the list of endpoint tuples whose pixels differ (empty when equivalent).
+    """
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(trials):
+        lines.append(tuple(rng.randint(0, 800) for _ in range(4)))
+        lines.append(tuple(rng.uniform(0, 800) for _ in range(4)))
+    for _ in range(trials // 10):
+        diamond = Diamond(rng.randint(30, 770), rng.uniform(-15, 585), 30)
+        catcher = Catcher(rng.uniform(60, 720), 20, 120, 25, 20)
+        for shape in (diamond.get_edges(), catcher.get_corners()):
+            for i in range(4):
+                lines.append(shape[i] + shape[(i+1) % 4])
+
+    plotted = []
+    legacy_plot = LineDrawer.__dict__['plot_point']
+    legacy_sink = LineDrawer.sink
+    LineDrawer.plot_point = staticmethod(lambda x, y: plotted.append((math.floor(x), math.floor(y))))
+    LineDrawer.sink = None
+    mismatches = []
+    try:
+        for line in lines:
+            plotted.clear()
+            LineDrawer.draw(*line)
+            batch = PointBatch(capacity=16)
+            batch.add_pixels(LineDrawer.rasterize(*line))
+            if batch.points[:batch.count].tolist() != [list(p) for p in plotted]:
+                mismatches.append(line)
+    finally:
+        LineDrawer.plot_point = legacy_plot
+        LineDrawer.sink = legacy_sink
+    return mismatches
+
+def check_line_cache(trials=2000, seed=423):
+    """Translated integer lines served from the cache must match a fresh rasterization.
+
+    Fractional endpoints reuse the pattern of their rounded delta, so only the
+    last pixel can differ there where float noise changes the walk length.
+    """
+    rng = random.Random(seed)
+    LineDrawer.clear_cache()
+    mismatches = []
+    for _ in range(trials):
+        x1, y1 = rng.randint(0, 400), rng.randint(0, 300)
+        x2, y2 = x1 + rng.randint(-40, 40), y1 + rng.randint(-40, 40)
+        for shift in range(3):
+            ox, oy = rng.randint(-100, 100), rng.randint(-100, 100)
+            line = (x1 + ox, y1 + oy, x2 + ox, y2 + oy)
+            if LineDrawer.pixels(*line).tolist() != LineDrawer.rasterize(*line).tolist():
+                mismatches.append(line)
+    return mismatches
+
+def check_vectorized_rasterizer(trials=4000, seed=423):
+    """rasterize_lines must give every line the pixels of rasterize, in the same order.
+
+    Integer endpoints (all zones, points, axis-aligned and diagonal lines) have to match
+    exactly. Returns the endpoint tuples that differ.
+    """
+    rng = random.Random(seed)
+    lines = [tuple(rng.randint(-50, 850) for _ in range(4)) for _ in range(trials)]
+    for _ in range(trials):
+        x, y = rng.randint(0, 800), rng.randint(0, 600)
+        lines.append((x, y, x + rng.randint(-12, 12), y + rng.randint(-12, 12)))
+    for d in range(-5, 6):
+        lines += [(100, 100, 100 + d, 105), (100, 100, 105, 100 + d), (100, 100, 100 + d, 100 - d)]
+    pixels, starts = LineDrawer.rasterize_lines(lines)
+    return [line for i, line in enumerate(lines)
+            if pixels[starts[i]:starts[i+1]].tolist() != LineDrawer.rasterize(*line).tolist()]
+
+def check_diamond_field(trials=200, seed=423):
+    """DiamondField must agree with per-Diamond objects on movement, catches, is_out and pixels.
+
+    Returns the number of trials with a disagreement.
+    """
+    rng = random.Random(seed)
+    failures = 0
+    for _ in range(trials):
+        field = DiamondField(capacity=4)
+        diamonds = []
+        for _ in range(rng.randint(1, 300)):
+            d = Diamond(rng.randint(30, 770), rng.uniform(-40, 600), 30)
+            speed = rng.uniform(50, 400)
+            diamonds.append((d, speed))
+            field.spawn(d.x, d.y, d.size, speed, d.color)
+        catcher = Catcher(rng.uniform(60, 720), 20, 120, 25, 20)
+        dt = rng.uniform(0, 0.2)
+        field.move(dt)
+        game = DiamondGame.__new__(DiamondGame)   # only handle_collision's fields are needed
+        game.catcher = catcher
+        expected_hits, expected_out = [], []
+        for i, (d, speed) in enumerate(diamonds):
+            d.move(speed, dt)
+            game.diamond = d
+            if game.handle_collision():
+                expected_hits.append(i)
+            expected_out.append(d.is_out())
+
+        batch, single = PointBatch(capacity=16), PointBatch(capacity=16)
+        legacy_sink = LineDrawer.sink
+        try:
+            LineDrawer.sink = batch
+            field.draw()
+            LineDrawer.sink = single
+            for d, _ in diamonds:
+                d.draw()
+        finally:
+            LineDrawer.sink = legacy_sink
+        same_pixels = (np.array_equal(batch.points[:batch.count], single.points[:single.count]) and
+                       np.allclose(batch.colors[:batch.count], single.colors[:single.count]))
+        if (field.collide(catcher.get_aabb()).tolist() != expected_hits or
+                field.is_out().tolist() != expected_out or
+                not np.allclose(field.y[:field.count], [d.y for d, _ in diamonds]) or not same_pixels):
+            failures += 1
+            continue
+        field.remove(expected_hits)
+        if field.x[:field.count].tolist() != [d.x for i, (d, _) in enumerate(diamonds) if i not in expected_hits]:
+            failures += 1
+    return failures
+
+def check_framebuffer_sink(trials=200, seed=423):
+    """The software framebuffer must hold exactly the PointBatch pixels (clipped to the window).
+
+    Returns the number of frames whose images differ.
+    """
+    rng = random.Random(seed)
+    width, height = 800, 600
+    mismatches = 0
+    for _ in range(trials):
+        sink, batch = FramebufferSink(width, height), PointBatch(capacity=16)
+        expected = np.zeros((height, width, 3), dtype=np.uint8)
+        for _ in range(rng.randint(1, 8)):
+            color = (rng.random(), rng.random(), rng.random())
+            line = tuple(rng.uniform(-50, 850) for _ in range(4))
+            sink.set_color(color)
+            batch.set_color(color)
+            pixels = LineDrawer.rasterize(*line)
+            sink.add_pixels(pixels)
+            batch.add_pixels(pixels)
+        # replay the batch the way GL would draw it: points in order, off-window ones clipped
+        rgb = FramebufferSink.to_bytes(batch.colors[:batch.count])
+        for (x, y), c in zip(batch.points[:batch.count], rgb):
+            if 0 <= x < width and 0 <= y < height:
+                expected[y, x] = c
+        if not np.array_equal(sink.snapshot(), expected[::-1]):
+            mismatches += 1
+    return mismatches
+
+def main():
+    max_diamonds = int(sys.argv[sys.argv.index("--multi") + 1]) if "--multi" in sys.argv else 0
+    game = DiamondGame(report_fps="--fps" in sys.argv, software="--software" in sys.argv,
+                       max_diamonds=max_diamonds)
+    glutMainLoop()
+
+if __name__ == "__main__":
+    if "--check-raster" in sys.argv:
+        bad = check_batched_rasterizer()
+        print("Batched rasterizer matches plot_point" if not bad else f"{len(bad)} mismatching lines: {bad[:5]}")
+        bad_cache = check_line_cache()
+        print("Line cache matches rasterizer" if not bad_cache else f"{len(bad_cache)} stale cache hits: {bad_cache[:5]}")
+        print("Cache stats:", LineDrawer.cache_stats())
+        bad_vec = check_vectorized_rasterizer()
+        print("Vectorized rasterizer matches rasterize" if not bad_vec else f"{len(bad_vec)} mismatching lines: {bad_vec[:5]}")
+        bad_field = check_diamond_field()
+        print("Diamond field matches single diamonds" if not bad_field else f"{bad_field} mismatching diamond fields")
+        bad_sink = check_framebuffer_sink()
+        print("Framebuffer sink matches point batch" if not bad_sink else f"{bad_sink} mismatching sink frames")
+        sys.exit(1 if bad or bad_cache or bad_vec or bad_field or bad_sink else 0)
+    main()
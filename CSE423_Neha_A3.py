@@ -1,473 +1,845 @@
-from OpenGL.GL import *
-from OpenGL.GLUT import *
-from OpenGL.GLU import *
-import math 
-import random
-
-
-INITIAL_PLAYER_LIFE = 5
-MAX_MISSED_BULLETS = 15
-NUM_ENEMIES = 5
-ENEMY_HIT_RADIUS = 45.0  
-PLAYER_HIT_RADIUS = 30.0 
-BULLET_SIZE = 15.0
-ENEMY_BASE_RADIUS = 60.0  
-ENEMY_HEAD_RADIUS = 30.0  
-ENEMY_SCALE_SPEED = 0.00025 
-ENEMY_SCALE_MIN = 0.8
-ENEMY_SCALE_MAX = 1.2
-CHEAT_FIRE_COOLDOWN = 80
-
-WINDOW_WIDTH = 1000
-WINDOW_HEIGHT = 800 
-PLAYER_SPEED = 10.0 
-BULLET_SPEED = 0.6 
-ENEMY_SPEED = 0.015 
-GUN_ROTATION_SPEED = 0.125 
-CAMERA_ROTATION_SPEED = 0.3 
-CAMERA_MOVE_SPEED = 2.0 
-
-#Camera-related
-camera_position = (0, 500, 500)
-field_of_view = 120
-grid_size = 600
-random_value = 423
-
-class GameWorld:
-    def __init__(self):
-        self.main_player = PlayerCharacter()
-        self.enemy_list = []
-        self.bullet_list = []
-        self.points = 0
-        self.is_game_over = False
-        self.cheat_c_active = False
-        self.cheat_v_active = False
-        self.camera_first_person = False
-        
-        for _ in range(5):
-            self.enemy_list.append(EnemyCreature())
-    
-    def game_tick(self):
-        if self.is_game_over:
-            return
-            
-        for projectile in self.bullet_list[:]:
-            projectile.move()
-            if projectile.is_off_screen():
-                self.bullet_list.remove(projectile)
-                self.main_player.missed_shots += 1
-                
-        for attack in self.enemy_list:
-            attack.move_toward(self.main_player.location)
-            
-            #Collision with player
-            if self.main_player.hits(attack):
-                self.main_player.health -= 1
-                attack.reposition()
-                
-        for projectile in self.bullet_list[:]:
-            for attack in self.enemy_list[:]:
-                if projectile.hits(attack):
-                    self.points += 1
-                    if projectile in self.bullet_list:
-                        self.bullet_list.remove(projectile)
-                    attack.reposition()
-                    break
-                    
-        #Game end conditions
-        if self.main_player.health <= 0 or self.main_player.missed_shots >= 10:
-            self.is_game_over = True
-            
-        # Cheat mode
-        if self.cheat_c_active:
-            self.main_player.weapon_rotation += 0.125
-
-class PlayerCharacter:
-    def __init__(self):
-        self.location = [0, 0, 15]
-        self.weapon_rotation = 0
-        self.health = 5
-        self.missed_shots = 0
-        
-    def change_position(self, movement_direction):
-        movement_speed = 10.0
-        if movement_direction == "ahead":
-            self.location[0] -= movement_speed * math.sin(math.radians(-self.weapon_rotation))
-            self.location[1] -= movement_speed * math.cos(math.radians(self.weapon_rotation))
-        elif movement_direction == "behind":
-            self.location[0] += movement_speed * math.sin(math.radians(-self.weapon_rotation))
-            self.location[1] += movement_speed * math.cos(math.radians(self.weapon_rotation))
-            
-        # Constrain to play area
-        edge_buffer = 10
-        self.location[0] = max(-grid_size + edge_buffer, min(grid_size - edge_buffer, self.location[0]))
-        self.location[1] = max(-grid_size + edge_buffer, min(grid_size - edge_buffer, self.location[1]))
-    
-    def adjust_weapon(self, rotation_direction):
-        if rotation_direction == "counter_clockwise":
-            self.weapon_rotation += 2.5
-        elif rotation_direction == "clockwise":
-            self.weapon_rotation -= 2.5
-        self.weapon_rotation %= 360
-    
-    def shoot(self):
-        angle_radians = math.radians(self.weapon_rotation - 90)
-        bullet_position = [
-            self.location[0] + 85 * math.cos(angle_radians),
-            self.location[1] + 85 * math.sin(angle_radians),
-            self.location[2] + 80
-        ]
-        bullet_direction = [math.cos(angle_radians), math.sin(angle_radians)]
-        return Projectile(bullet_position, bullet_direction)
-    
-    def hits(self, enemy):
-        x_diff = self.location[0] - enemy.position[0]
-        y_diff = self.location[1] - enemy.position[1]
-        distance = math.sqrt(x_diff*x_diff + y_diff*y_diff)
-        return distance < (30 + 40 * enemy.size_factor)
-    
-    def render(self):
-        glPushMatrix()
-        glTranslatef(self.location[0], self.location[1], self.location[2])
-        glRotatef(self.weapon_rotation, 0, 0, 1)
-        
-        #player body
-        glColor3f(0.0, 0.0, 1.0)
-        glPushMatrix()
-        glTranslatef(15, 0, 0)
-        gluCylinder(gluNewQuadric(), 5, 10, 50, 10, 10)
-        glPopMatrix()
-        
-        glPushMatrix()
-        glTranslatef(-15, 0, 0)
-        gluCylinder(gluNewQuadric(), 5, 10, 50, 10, 10)
-        glPopMatrix()
-        
-        glPushMatrix()
-        glTranslatef(0, 0, 70)
-        glColor3f(85/255, 108/255, 47/255)
-        glutSolidCube(40)
-        glPopMatrix()
-        
-        glPushMatrix()
-        glTranslatef(0, 0, 110)
-        glColor3f(0.0, 0.0, 0.0)
-        gluSphere(gluNewQuadric(), 20, 10, 10)
-        glPopMatrix()
-        
-        #weapon
-        glPushMatrix()
-        glTranslatef(20, -40, 0)
-        glRotatef(-90, 1, 0, 0)
-        glColor3f(192/255, 192/255, 192/255)
-        gluCylinder(gluNewQuadric(), 1, 10, 80, 10, 10)
-        glPopMatrix()
-        
-        glPopMatrix()
-
-class EnemyCreature:
-    def __init__(self):
-        self.position = [0, 0, 40]
-        self.size_factor = 1.0
-        self.scaling_direction = 1
-        self.reposition()
-        
-    def reposition(self):
-        self.position = [
-            random.uniform(-grid_size * 0.9, grid_size * 0.9),
-            random.uniform(-grid_size * 0.9, grid_size * 0.9),
-            40
-        ]
-        
-    def move_toward(self, target_position):
-        # Move towards target
-        x_diff = target_position[0] - self.position[0]
-        y_diff = target_position[1] - self.position[1]
-        distance = math.sqrt(x_diff*x_diff + y_diff*y_diff)
-        if distance > 0:
-            self.position[0] += (x_diff / distance) * 0.015
-            self.position[1] += (y_diff / distance) * 0.015
-            
-        #size effect
-        self.size_factor += self.scaling_direction * 0.00025
-        if self.size_factor > 1.2:
-            self.size_factor = 1.2
-            self.scaling_direction = -1
-        elif self.size_factor < 0.8:
-            self.size_factor = 0.8
-            self.scaling_direction = 1
-    
-    def render(self):
-        glPushMatrix()
-        glTranslatef(self.position[0], self.position[1], self.position[2])
-        glScalef(self.size_factor, self.size_factor, self.size_factor)
-        
-        #enemy base
-        glColor3f(1.0, 0.0, 0.0)
-        gluSphere(gluNewQuadric(), 40, 12, 12)
-        
-        #enemy top
-        glPushMatrix()
-        glTranslatef(0, 0, 52)
-        glColor3f(0, 0, 0)
-        gluSphere(gluNewQuadric(), 20, 10, 10)
-        glPopMatrix()
-        
-        glPopMatrix()
-
-class Projectile:
-    def __init__(self, position, direction):
-        self.position = position
-        self.direction = direction
-        self.velocity = 0.6
-        
-    def move(self):
-        self.position[0] += self.direction[0] * self.velocity
-        self.position[1] += self.direction[1] * self.velocity
-        
-    def is_off_screen(self):
-        return (abs(self.position[0]) > grid_size or 
-                abs(self.position[1]) > grid_size)
-                
-    def hits(self, enemy):
-        x_diff = self.position[0] - enemy.position[0]
-        y_diff = self.position[1] - enemy.position[1]
-        distance = math.sqrt(x_diff*x_diff + y_diff*y_diff)
-        return distance < (5 + 40 * enemy.size_factor)
-        
-    def render(self):
-        glPushMatrix()
-        glTranslatef(self.position[0], self.position[1], self.position[2])
-        glColor3f(1.0, 1.0, 1.0)
-        glutSolidCube(10)
-        glPopMatrix()
-
-game_world = GameWorld()
-
-def render_text(x, y, text_string, font_style=GLUT_BITMAP_HELVETICA_18):
-    glColor3f(1,1,1)
-    glMatrixMode(GL_PROJECTION)
-    glPushMatrix()
-    glLoadIdentity()
-    #Orthographic projection matching window dimensions
-    gluOrtho2D(0, 1000, 0, 800)
-
-    glMatrixMode(GL_MODELVIEW)
-    glPushMatrix()
-    glLoadIdentity()
-    
-    # Render text at screen coordinates
-    glRasterPos2f(x, y)
-    for character in text_string:
-        glutBitmapCharacter(font_style, ord(character))
-    
-    glPopMatrix()
-    glMatrixMode(GL_PROJECTION)
-    glPopMatrix()
-    glMatrixMode(GL_MODELVIEW)
-
-
-def draw_play_area():
-    glBegin(GL_QUADS)
-    for x_coord in range(-grid_size, grid_size + 1, 100):
-        for y_coord in range(-grid_size, grid_size + 1, 100):
-            if (x_coord + y_coord) % 200 == 0:
-                glColor3f(1, 1, 1)  
-            else:
-                glColor3f(0.7, 0.5, 0.95)  
-            
-            glVertex3f(x_coord, y_coord, 0)                 
-            glVertex3f(x_coord + 100, y_coord, 0)           
-            glVertex3f(x_coord + 100, y_coord + 100, 0)     
-            glVertex3f(x_coord, y_coord + 100, 0)           
-
-    #boundary walls
-    glColor3f(0.0, 1.0, 0.0)  
-    glVertex3f(-grid_size, -grid_size, 0)           
-    glVertex3f(-grid_size, grid_size + 100, 0)      
-    glVertex3f(-grid_size, grid_size + 100, 100)    
-    glVertex3f(-grid_size, -grid_size, 100)         
-
-    glColor3f(0.0, 0.0, 1.0)  
-    glVertex3f(grid_size + 100, -grid_size, 0)      
-    glVertex3f(grid_size + 100, grid_size + 100, 0) 
-    glVertex3f(grid_size + 100, grid_size + 100, 100) 
-    glVertex3f(grid_size + 100, -grid_size, 100)    
-
-    glColor3f(0.0, 1.0, 1.0)  
-    glVertex3f(-grid_size, -grid_size, 0)           
-    glVertex3f(grid_size + 100, -grid_size, 0)      
-    glVertex3f(grid_size + 100, -grid_size, 100)    
-    glVertex3f(-grid_size, -grid_size, 100)         
- 
-    glColor3f(1.0, 1.0, 1.0)  
-    glVertex3f(-grid_size, grid_size + 100, 0)      
-    glVertex3f(grid_size + 100, grid_size + 100, 0) 
-    glVertex3f(grid_size + 100, grid_size + 100, 100) 
-    glVertex3f(-grid_size, grid_size + 100, 100)    
-
-    glEnd()
-
-
-def handle_keyboard(key, x, y):
-   
-    global game_world
-    
-    #Move forward (E)
-    if key == b'e' or key == b'E':  
-        game_world.main_player.change_position("ahead")
-    
-    #Move backward (D)
-    if key == b'd' or key == b'D':
-        game_world.main_player.change_position("behind")
-    
-    #Rotate weapon left (S)
-    if key == b's' or key == b'S':
-        game_world.main_player.adjust_weapon("counter clockwise")
-    
-    #Rotate weapon right (F)
-    if key == b'f' or key == b'F':
-        game_world.main_player.adjust_weapon("clockwise")
-    
-    #Toggle cheat mode (C)
-    if key == b'c' or key == b'C':
-        game_world.cheat_c_active = not game_world.cheat_c_active
-        print(f"Cheat mode C: {game_world.cheat_c_active}")
-    
-    #Toggle cheat vision (V)
-    if key == b'v' or key == b'V':
-        if game_world.cheat_c_active and game_world.camera_first_person:
-            game_world.cheat_v_active = not game_world.cheat_v_active
-            print(f"Cheat mode V: {game_world.cheat_v_active}")
-    
-    #Reset game (R)
-    if key == b'r' or key == b'R':
-        if game_world.is_game_over:
-            game_world = GameWorld()
-            print("Game reset")
-
-
-def handle_special_keys(key, x, y): #Processes special key inputs for camera adjustment
-
-    global camera_position
-    x, y, z = camera_position
-    
-    #Move camera up (UP arrow)
-    if key == GLUT_KEY_UP:
-        z += 2.0
-
-    #Move camera down (DOWN arrow)
-    if key == GLUT_KEY_DOWN:
-        z -= 2.0
-        z = max(10, z)  # Prevent going below ground
-
-    #Rotate camera left (LEFT arrow)
-    if key == GLUT_KEY_LEFT:
-        x -= 1
-
-    #Rotate camera right (RIGHT arrow)
-    if key == GLUT_KEY_RIGHT:
-        x += 1
-
-    camera_position = (x, y, z)
-
-def handle_mouse(button, state, x, y):    #Processes mouse inputs for shooting and camera mode toggling
-
-    global game_world
-    
-    #Left mouse button shoots
-    if button == GLUT_LEFT_BUTTON and state == GLUT_DOWN:
-        if not game_world.cheat_c_active and not game_world.is_game_over:
-            new_bullet = game_world.main_player.shoot()
-            game_world.bullet_list.append(new_bullet)
-
-    #Right mouse button toggles camera mode
-    if button == GLUT_RIGHT_BUTTON and state == GLUT_DOWN:
-        game_world.camera_first_person = not game_world.camera_first_person
-        print(f"First person mode: {game_world.camera_first_person}")
-
-
-def configure_camera():  #Sets up the camera's projection and view parameters
-
-    global camera_position, game_world
-    
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    # Set up perspective projection
-    gluPerspective(field_of_view, 1.25, 0.1, 1500)
-    
-    glMatrixMode(GL_MODELVIEW)
-    glLoadIdentity()
-
-    # Extract camera position
-    x, y, z = camera_position
-    
-    if game_world.camera_first_person:
-        # First-person camera from player's viewpoint
-        player_x, player_y, player_z = game_world.main_player.location
-        eye_x = player_x
-        eye_y = player_y
-        eye_z = player_z + 140  # Eye level
-        
-        # Look in weapon direction
-        angle_rad = math.radians(-game_world.main_player.weapon_rotation)
-        center_x = eye_x - math.sin(angle_rad) * 100
-        center_y = eye_y - math.cos(angle_rad) * 100
-        center_z = eye_z
-        
-        gluLookAt(eye_x, eye_y, eye_z, center_x, center_y, center_z, 0, 0, 1)
-    else:
-        # Third-person camera
-        gluLookAt(x, y, z, 0, 0, 0, 0, 0, 1)
-
-
-def idle_processing(): #Continuous processing function for game updates and rendering
-    game_world.game_tick()
-    glutPostRedisplay()
-
-
-def display_scene():
-
-    # Clear buffers
-    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-    glLoadIdentity()
-    glViewport(0, 0, 1000, 800)
-
-    configure_camera()
-
-    #game elements
-    draw_play_area()
-    game_world.main_player.render()
-    for enemy in game_world.enemy_list:
-        enemy.render()
-    for bullet in game_world.bullet_list:
-        bullet.render()
-    
-    #display game information
-    render_text(10, 770, f"Score: {game_world.points}")
-    render_text(10, 740, f"Health: {game_world.main_player.health}")
-    render_text(10, 710, f"Missed Shots: {game_world.main_player.missed_shots}")
-    
-    if game_world.is_game_over:
-        render_text(400, 400, "GAME OVER - Press R to restart", GLUT_BITMAP_TIMES_ROMAN_24)
-
-    # Swap buffers
-    glutSwapBuffers()
-
-
-# Main application entry point
-def main():
-    glutInit()
-    glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
-    glutInitWindowSize(1000, 800)
-    glutInitWindowPosition(0, 0)
-    window = glutCreateWindow(b"3D OpenGL Game")
-    glutDisplayFunc(display_scene)
-    glutKeyboardFunc(handle_keyboard)
-    glutSpecialFunc(handle_special_keys)
-    glutMouseFunc(handle_mouse)
-    glutIdleFunc(idle_processing)
-    glutMainLoop()
-
-if __name__ == "__main__":
+from OpenGL.GL import *
+from OpenGL.GLUT import *
+from OpenGL.GLU import *
+import math 
+import random
+import sys
+import numpy as np
+from mesh_cache import meshes
+from bitmap_text import text
+from frame_profiler import profiler
+from frame_pacer import FramePacer
+
+
+INITIAL_PLAYER_LIFE = 5
+MAX_MISSED_BULLETS = 15
+NUM_ENEMIES = 5
+ENEMY_HIT_RADIUS = 45.0  
+PLAYER_HIT_RADIUS = 30.0 
+BULLET_SIZE = 15.0
+ENEMY_BASE_RADIUS = 60.0  
+ENEMY_HEAD_RADIUS = 30.0  
+ENEMY_SCALE_SPEED = 0.00025 
+ENEMY_SCALE_MIN = 0.8
+ENEMY_SCALE_MAX = 1.2
+CHEAT_FIRE_COOLDOWN = 80
+COLLISION_CELL_SIZE = 100.0  # must stay >= bullet/enemy reach (5 + 40 * ENEMY_SCALE_MAX)
+
+TARGET_FPS = 60    #game_tick runs once per frame, so this is also the simulation rate
+WINDOW_WIDTH = 1000
+WINDOW_HEIGHT = 800 
+PLAYER_SPEED = 10.0 
+BULLET_SPEED = 0.6 
+ENEMY_SPEED = 0.015 
+GUN_ROTATION_SPEED = 0.125 
+CAMERA_ROTATION_SPEED = 0.3 
+CAMERA_MOVE_SPEED = 2.0 
+
+#Camera-related
+camera_position = (0, 500, 500)
+field_of_view = 120
+grid_size = 600
+random_value = 423
+TILE_SIZE = 100
+
+class GameWorld:
+    def __init__(self, pooled=True):
+        self.main_player = PlayerCharacter()
+        self.enemy_list = []
+        self.bullet_list = []
+        #pooled mode keeps bullets/enemies in struct-of-arrays pools instead of the lists above
+        self.pooled = pooled
+        self.bullets = EntityPool()
+        self.enemies = EntityPool(capacity=NUM_ENEMIES)
+        self.points = 0
+        self.is_game_over = False
+        self.cheat_c_active = False
+        self.cheat_v_active = False
+        self.camera_first_person = False
+        self.use_spatial_hash = True
+        self.enemy_grid = SpatialHash()
+        
+        for _ in range(NUM_ENEMIES):
+            if pooled:
+                self.enemies.reposition(self.enemies.spawn([0, 0, 40]))
+            else:
+                self.enemy_list.append(EnemyCreature())
+
+    def fire(self):
+        if self.pooled:
+            position, direction = self.main_player.muzzle()
+            self.bullets.spawn(position, direction, BULLET_SPEED)
+        else:
+            self.bullet_list.append(self.main_player.shoot())
+
+    def render_entities(self):
+        if self.pooled:
+            enemies, bullets = self.enemies, self.bullets
+            for (x, y, z), size in zip(enemies.positions[:enemies.count].tolist(),
+                                       enemies.size_factors[:enemies.count].tolist()):
+                EnemyCreature.draw_at(x, y, z, size)
+            for x, y, z in bullets.positions[:bullets.count].tolist():
+                Projectile.draw_at(x, y, z)
+            return
+        for enemy in self.enemy_list:
+            enemy.render()
+        for bullet in self.bullet_list:
+            bullet.render()
+    
+    def game_tick(self):
+        if self.is_game_over:
+            return
+        if self.pooled:
+            self.tick_pooled()
+        else:
+            self.tick_objects()
+                    
+        #Game end conditions
+        if self.main_player.health <= 0 or self.main_player.missed_shots >= 10:
+            self.is_game_over = True
+            
+        # Cheat mode
+        if self.cheat_c_active:
+            self.main_player.weapon_rotation += 0.125
+
+    def tick_pooled(self):
+        bullets, enemies = self.bullets, self.enemies
+        bullets.move()
+        gone = bullets.off_screen_mask(grid_size)
+        self.main_player.missed_shots += int(np.count_nonzero(gone))
+        bullets.despawn_mask(gone)
+
+        enemies.move_toward(self.main_player.location, ENEMY_SPEED)
+        enemies.pulse_sizes()
+
+        #Collision with player
+        reach = 30 + 40 * enemies.size_factors[:enemies.count]
+        for index in np.flatnonzero(enemies.distances_to(self.main_player.location) < reach):
+            self.main_player.health -= 1
+            enemies.reposition(index)
+
+        if bullets.count and enemies.count:
+            bullets.despawn_mask(self.collide_pooled())
+
+    def collide_pooled(self):
+        #spatial-hash broad phase over the enemy pool; returns the mask of bullets that hit
+        enemies = self.enemies
+        self.enemy_grid.rebuild(enemies.positions[:enemies.count].tolist())
+        enemy_xy = enemies.positions[:enemies.count, :2].tolist()
+        enemy_reach = (5 + 40 * enemies.size_factors[:enemies.count]).tolist()
+        hit = np.zeros(self.bullets.count, dtype=bool)
+        for bullet, (x, y) in enumerate(self.bullets.positions[:self.bullets.count, :2].tolist()):
+            for index in self.enemy_grid.nearby(x, y):
+                ex, ey = enemy_xy[index]
+                if math.hypot(x - ex, y - ey) < enemy_reach[index]:
+                    self.points += 1
+                    enemies.reposition(index)
+                    enemy_xy[index] = enemies.positions[index, :2].tolist()
+                    self.enemy_grid.move(index, *enemy_xy[index])
+                    hit[bullet] = True
+                    break
+        return hit
+
+    def tick_objects(self):
+        survivors = []
+        for projectile in self.bullet_list:
+            projectile.move()
+            if projectile.is_off_screen():
+                self.main_player.missed_shots += 1
+            else:
+                survivors.append(projectile)
+        self.bullet_list = survivors
+                
+        for attack in self.enemy_list:
+            attack.move_toward(self.main_player.location)
+            
+            #Collision with player
+            if self.main_player.hits(attack):
+                self.main_player.health -= 1
+                attack.reposition()
+                
+        if self.use_spatial_hash:
+            self.bullet_list = self.collide_bullets_hashed()
+        else:
+            self.bullet_list = self.collide_bullets_brute_force()
+
+    def collide_bullets_brute_force(self):
+        #every bullet against every enemy, first hit wins
+        survivors = []
+        for projectile in self.bullet_list:
+            for attack in self.enemy_list:
+                if projectile.hits(attack):
+                    self.points += 1
+                    attack.reposition()
+                    break
+            else:
+                survivors.append(projectile)
+        return survivors
+
+    def collide_bullets_hashed(self):
+        #same order and outcome as brute force, but only enemies in the 3x3 neighbouring cells are tested
+        if not self.bullet_list:
+            return self.bullet_list
+        self.enemy_grid.rebuild(attack.position for attack in self.enemy_list)
+        survivors = []
+        for projectile in self.bullet_list:
+            for index in self.enemy_grid.nearby(projectile.position[0], projectile.position[1]):
+                attack = self.enemy_list[index]
+                if projectile.hits(attack):
+                    self.points += 1
+                    attack.reposition()
+                    self.enemy_grid.move(index, attack.position[0], attack.position[1])
+                    break
+            else:
+                survivors.append(projectile)
+        return survivors
+
+class SpatialHash:
+    #uniform grid broad phase: cell -> indices of the objects inside it
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.cell_of = []
+
+    def cell_key(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def rebuild(self, positions):
+        self.cells.clear()
+        self.cell_of = []
+        for index, position in enumerate(positions):
+            key = self.cell_key(position[0], position[1])
+            self.cells.setdefault(key, []).append(index)
+            self.cell_of.append(key)
+
+    def move(self, index, x, y):
+        key = self.cell_key(x, y)
+        old_key = self.cell_of[index]
+        if key != old_key:
+            self.cells[old_key].remove(index)
+            self.cells.setdefault(key, []).append(index)
+            self.cell_of[index] = key
+
+    def nearby(self, x, y):
+        #candidates in ascending index order so the first hit matches the brute-force scan
+        cell_x, cell_y = self.cell_key(x, y)
+        found = []
+        for ix in range(cell_x - 1, cell_x + 2):
+            for iy in range(cell_y - 1, cell_y + 2):
+                found.extend(self.cells.get((ix, iy), ()))
+        found.sort()
+        return found
+
+class PlayerCharacter:
+    def __init__(self):
+        self.location = [0, 0, 15]
+        self.weapon_rotation = 0
+        self.health = 5
+        self.missed_shots = 0
+        
+    def change_position(self, movement_direction):
+        movement_speed = 10.0
+        if movement_direction == "ahead":
+            self.location[0] -= movement_speed * math.sin(math.radians(-self.weapon_rotation))
+            self.location[1] -= movement_speed * math.cos(math.radians(self.weapon_rotation))
+        elif movement_direction == "behind":
+            self.location[0] += movement_speed * math.sin(math.radians(-self.weapon_rotation))
+            self.location[1] += movement_speed * math.cos(math.radians(self.weapon_rotation))
+            
+        # Constrain to play area
+        edge_buffer = 10
+        self.location[0] = max(-grid_size + edge_buffer, min(grid_size - edge_buffer, self.location[0]))
+        self.location[1] = max(-grid_size + edge_buffer, min(grid_size - edge_buffer, self.location[1]))
+    
+    def adjust_weapon(self, rotation_direction):
+        if rotation_direction == "counter_clockwise":
+            self.weapon_rotation += 2.5
+        elif rotation_direction == "clockwise":
+            self.weapon_rotation -= 2.5
+        self.weapon_rotation %= 360
+    
+    def muzzle(self):
+        angle_radians = math.radians(self.weapon_rotation - 90)
+        bullet_position = [
+            self.location[0] + 85 * math.cos(angle_radians),
+            self.location[1] + 85 * math.sin(angle_radians),
+            self.location[2] + 80
+        ]
+        bullet_direction = [math.cos(angle_radians), math.sin(angle_radians)]
+        return bullet_position, bullet_direction
+
+    def shoot(self):
+        return Projectile(*self.muzzle())
+    
+    def hits(self, enemy):
+        x_diff = self.location[0] - enemy.position[0]
+        y_diff = self.location[1] - enemy.position[1]
+        distance = math.sqrt(x_diff*x_diff + y_diff*y_diff)
+        return distance < (30 + 40 * enemy.size_factor)
+    
+    def render(self):
+        glPushMatrix()
+        glTranslatef(self.location[0], self.location[1], self.location[2])
+        glRotatef(self.weapon_rotation, 0, 0, 1)
+        meshes.call("player", PlayerCharacter.build_mesh)
+        glPopMatrix()
+
+    @staticmethod
+    def build_mesh():
+        #player body
+        glColor3f(0.0, 0.0, 1.0)
+        glPushMatrix()
+        glTranslatef(15, 0, 0)
+        gluCylinder(meshes.quadric(), 5, 10, 50, 10, 10)
+        glPopMatrix()
+        
+        glPushMatrix()
+        glTranslatef(-15, 0, 0)
+        gluCylinder(meshes.quadric(), 5, 10, 50, 10, 10)
+        glPopMatrix()
+        
+        glPushMatrix()
+        glTranslatef(0, 0, 70)
+        glColor3f(85/255, 108/255, 47/255)
+        glutSolidCube(40)
+        glPopMatrix()
+        
+        glPushMatrix()
+        glTranslatef(0, 0, 110)
+        glColor3f(0.0, 0.0, 0.0)
+        gluSphere(meshes.quadric(), 20, 10, 10)
+        glPopMatrix()
+        
+        #weapon
+        glPushMatrix()
+        glTranslatef(20, -40, 0)
+        glRotatef(-90, 1, 0, 0)
+        glColor3f(192/255, 192/255, 192/255)
+        gluCylinder(meshes.quadric(), 1, 10, 80, 10, 10)
+        glPopMatrix()
+
+class EnemyCreature:
+    def __init__(self):
+        self.position = [0, 0, 40]
+        self.size_factor = 1.0
+        self.scaling_direction = 1
+        self.reposition()
+        
+    def reposition(self):
+        self.position = [
+            random.uniform(-grid_size * 0.9, grid_size * 0.9),
+            random.uniform(-grid_size * 0.9, grid_size * 0.9),
+            40
+        ]
+        
+    def move_toward(self, target_position):
+        # Move towards target
+        x_diff = target_position[0] - self.position[0]
+        y_diff = target_position[1] - self.position[1]
+        distance = math.sqrt(x_diff*x_diff + y_diff*y_diff)
+        if distance > 0:
+            self.position[0] += (x_diff / distance) * 0.015
+            self.position[1] += (y_diff / distance) * 0.015
+            
+        #size effect
+        self.size_factor += self.scaling_direction * 0.00025
+        if self.size_factor > 1.2:
+            self.size_factor = 1.2
+            self.scaling_direction = -1
+        elif self.size_factor < 0.8:
+            self.size_factor = 0.8
+            self.scaling_direction = 1
+    
+    def render(self):
+        EnemyCreature.draw_at(self.position[0], self.position[1], self.position[2], self.size_factor)
+
+    @staticmethod
+    def draw_at(x, y, z, size_factor):
+        glPushMatrix()
+        glTranslatef(x, y, z)
+        glScalef(size_factor, size_factor, size_factor)
+        meshes.call("enemy", EnemyCreature.build_mesh)
+        glPopMatrix()
+
+    @staticmethod
+    def build_mesh():
+        #enemy base
+        glColor3f(1.0, 0.0, 0.0)
+        gluSphere(meshes.quadric(), 40, 12, 12)
+        
+        #enemy top
+        glPushMatrix()
+        glTranslatef(0, 0, 52)
+        glColor3f(0, 0, 0)
+        gluSphere(meshes.quadric(), 20, 10, 10)
+        glPopMatrix()
+
+class Projectile:
+    def __init__(self, position, direction):
+        self.position = position
+        self.direction = direction
+        self.velocity = 0.6
+        
+    def move(self):
+        self.position[0] += self.direction[0] * self.velocity
+        self.position[1] += self.direction[1] * self.velocity
+        
+    def is_off_screen(self):
+        return (abs(self.position[0]) > grid_size or 
+                abs(self.position[1]) > grid_size)
+                
+    def hits(self, enemy):
+        x_diff = self.position[0] - enemy.position[0]
+        y_diff = self.position[1] - enemy.position[1]
+        distance = math.sqrt(x_diff*x_diff + y_diff*y_diff)
+        return distance < (5 + 40 * enemy.size_factor)
+        
+    def render(self):
+        Projectile.draw_at(self.position[0], self.position[1], self.position[2])
+
+    @staticmethod
+    def draw_at(x, y, z):
+        glPushMatrix()
+        glTranslatef(x, y, z)
+        glColor3f(1.0, 1.0, 1.0)
+        glutSolidCube(10)
+        glPopMatrix()
+
+class EntityPool:
+    #struct-of-arrays store for bullets/enemies, live entities packed into [0, count)
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.positions = np.zeros((capacity, 3))
+        self.directions = np.zeros((capacity, 2))
+        self.velocities = np.zeros(capacity)
+        self.size_factors = np.ones(capacity)
+        self.scaling_directions = np.ones(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def grow(self):
+        capacity = 2 * len(self.alive)
+        for name in ('positions', 'directions', 'velocities', 'size_factors', 'scaling_directions', 'alive'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, position, direction=(0.0, 0.0), velocity=0.0):
+        if self.count == len(self.alive):
+            self.grow()
+        index = self.count
+        self.positions[index] = position
+        self.directions[index] = direction
+        self.velocities[index] = velocity
+        self.size_factors[index] = 1.0
+        self.scaling_directions[index] = 1
+        self.alive[index] = True
+        self.count += 1
+        return index
+
+    def despawn(self, index):
+        #swap-remove: the last live entity takes the freed slot
+        last = self.count - 1
+        if index != last:
+            self.positions[index] = self.positions[last]
+            self.directions[index] = self.directions[last]
+            self.velocities[index] = self.velocities[last]
+            self.size_factors[index] = self.size_factors[last]
+            self.scaling_directions[index] = self.scaling_directions[last]
+        self.alive[last] = False
+        self.count = last
+
+    def despawn_mask(self, mask):
+        for index in np.flatnonzero(mask)[::-1]:
+            self.despawn(index)
+
+    def reposition(self, index):
+        self.positions[index] = (
+            random.uniform(-grid_size * 0.9, grid_size * 0.9),
+            random.uniform(-grid_size * 0.9, grid_size * 0.9),
+            40
+        )
+
+    def move(self):
+        n = self.count
+        self.positions[:n, :2] += self.directions[:n] * self.velocities[:n, None]
+
+    def move_toward(self, target_position, speed):
+        n = self.count
+        diff = np.asarray(target_position[:2], dtype=float) - self.positions[:n, :2]
+        distance = np.hypot(diff[:, 0], diff[:, 1])
+        moving = distance > 0
+        self.positions[:n, :2][moving] += diff[moving] / distance[moving, None] * speed
+
+    def pulse_sizes(self):
+        n = self.count
+        sizes, directions = self.size_factors[:n], self.scaling_directions[:n]
+        sizes += directions * ENEMY_SCALE_SPEED
+        over = sizes > ENEMY_SCALE_MAX
+        under = sizes < ENEMY_SCALE_MIN
+        sizes[over] = ENEMY_SCALE_MAX
+        directions[over] = -1
+        sizes[under] = ENEMY_SCALE_MIN
+        directions[under] = 1
+
+    def off_screen_mask(self, limit):
+        xy = self.positions[:self.count, :2]
+        return (np.abs(xy[:, 0]) > limit) | (np.abs(xy[:, 1]) > limit)
+
+    def distances_to(self, point):
+        xy = self.positions[:self.count, :2]
+        return np.hypot(point[0] - xy[:, 0], point[1] - xy[:, 1])
+
+game_world = GameWorld()
+
+text_block_open = False
+
+def begin_text():
+    #Sets up the window projection once for a block of render_text calls; strings are batched
+    global text_block_open
+    glMatrixMode(GL_PROJECTION)
+    glPushMatrix()
+    glLoadIdentity()
+    gluOrtho2D(0, 1000, 0, 800)
+    glMatrixMode(GL_MODELVIEW)
+    glPushMatrix()
+    glLoadIdentity()
+    text.begin()
+    text_block_open = True
+
+def end_text():
+    global text_block_open
+    text.flush()
+    text_block_open = False
+    glPopMatrix()
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
+
+def release_gl():
+    meshes.release()
+    text.release()
+
+def render_text(x, y, text_string, font_style=GLUT_BITMAP_HELVETICA_18):
+    if text_block_open:
+        text.draw(x, y, text_string, (1, 1, 1), font_style)
+        return
+    glColor3f(1,1,1)
+    glMatrixMode(GL_PROJECTION)
+    glPushMatrix()
+    glLoadIdentity()
+    #Orthographic projection matching window dimensions
+    gluOrtho2D(0, 1000, 0, 800)
+
+    glMatrixMode(GL_MODELVIEW)
+    glPushMatrix()
+    glLoadIdentity()
+    
+    # Render text at screen coordinates
+    glRasterPos2f(x, y)
+    for character in text_string:
+        glutBitmapCharacter(font_style, ord(character))
+    
+    glPopMatrix()
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
+
+
+class ArenaMesh:
+    #checkerboard floor + walls as one interleaved colour/position buffer, rebuilt only when grid_size changes
+    def __init__(self, tile=TILE_SIZE):
+        self.tile = tile
+        self.built_for = None
+        self.vertex_count = 0
+
+    def build(self, size):
+        tile = self.tile
+        coords = np.arange(-size, size + 1, tile)
+        xs, ys = np.meshgrid(coords, coords, indexing='ij')
+        xs, ys = xs.ravel(), ys.ravel()
+        light = ((xs + ys) % (2 * tile) == 0)[:, None]
+        colors = np.where(light, (1.0, 1.0, 1.0), (0.7, 0.5, 0.95))
+
+        floor = np.zeros((len(xs), 4, 6), dtype=np.float32)  # r g b x y z per corner
+        for corner, (dx, dy) in enumerate(((0, 0), (tile, 0), (tile, tile), (0, tile))):
+            floor[:, corner, 0:3] = colors
+            floor[:, corner, 3] = xs + dx
+            floor[:, corner, 4] = ys + dy
+
+        low, high = -size, size + tile
+        walls = np.array([
+            [(0, 1, 0, low, low, 0), (0, 1, 0, low, high, 0), (0, 1, 0, low, high, 100), (0, 1, 0, low, low, 100)],
+            [(0, 0, 1, high, low, 0), (0, 0, 1, high, high, 0), (0, 0, 1, high, high, 100), (0, 0, 1, high, low, 100)],
+            [(0, 1, 1, low, low, 0), (0, 1, 1, high, low, 0), (0, 1, 1, high, low, 100), (0, 1, 1, low, low, 100)],
+            [(1, 1, 1, low, high, 0), (1, 1, 1, high, high, 0), (1, 1, 1, high, high, 100), (1, 1, 1, low, high, 100)],
+        ], dtype=np.float32)
+
+        vertices = np.concatenate((floor.reshape(-1, 6), walls.reshape(-1, 6)))
+        meshes.buffer("arena", vertices)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.vertex_count = len(vertices)
+        self.built_for = (size, tile)
+
+    def draw(self):
+        if self.built_for != (grid_size, self.tile):
+            self.build(grid_size)
+        meshes.buffer("arena")
+        glInterleavedArrays(GL_C3F_V3F, 0, None)
+        glDrawArrays(GL_QUADS, 0, self.vertex_count)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+arena = ArenaMesh()
+use_arena_buffer = True
+
+
+def draw_play_area():
+    if use_arena_buffer:
+        arena.draw()
+    else:
+        draw_play_area_immediate()
+
+
+def draw_play_area_immediate():
+    glBegin(GL_QUADS)
+    for x_coord in range(-grid_size, grid_size + 1, 100):
+        for y_coord in range(-grid_size, grid_size + 1, 100):
+            if (x_coord + y_coord) % 200 == 0:
+                glColor3f(1, 1, 1)  
+            else:
+                glColor3f(0.7, 0.5, 0.95)  
+            
+            glVertex3f(x_coord, y_coord, 0)                 
+            glVertex3f(x_coord + 100, y_coord, 0)           
+            glVertex3f(x_coord + 100, y_coord + 100, 0)     
+            glVertex3f(x_coord, y_coord + 100, 0)           
+
+    #boundary walls
+    glColor3f(0.0, 1.0, 0.0)  
+    glVertex3f(-grid_size, -grid_size, 0)           
+    glVertex3f(-grid_size, grid_size + 100, 0)      
+    glVertex3f(-grid_size, grid_size + 100, 100)    
+    glVertex3f(-grid_size, -grid_size, 100)         
+
+    glColor3f(0.0, 0.0, 1.0)  
+    glVertex3f(grid_size + 100, -grid_size, 0)      
+    glVertex3f(grid_size + 100, grid_size + 100, 0) 
+    glVertex3f(grid_size + 100, grid_size + 100, 100) 
+    glVertex3f(grid_size + 100, -grid_size, 100)    
+
+    glColor3f(0.0, 1.0, 1.0)  
+    glVertex3f(-grid_size, -grid_size, 0)           
+    glVertex3f(grid_size + 100, -grid_size, 0)      
+    glVertex3f(grid_size + 100, -grid_size, 100)    
+    glVertex3f(-grid_size, -grid_size, 100)         
+ 
+    glColor3f(1.0, 1.0, 1.0)  
+    glVertex3f(-grid_size, grid_size + 100, 0)      
+    glVertex3f(grid_size + 100, grid_size + 100, 0) 
+    glVertex3f(grid_size + 100, grid_size + 100, 100) 
+    glVertex3f(-grid_size, grid_size + 100, 100)    
+
+    glEnd()
+
+
+def handle_keyboard(key, x, y):
+   
+    global game_world
+    
+    #Move forward (E)
+    if key == b'e' or key == b'E':  
+        game_world.main_player.change_position("ahead")
+    
+    #Move backward (D)
+    if key == b'd' or key == b'D':
+        game_world.main_player.change_position("behind")
+    
+    #Rotate weapon left (S)
+    if key == b's' or key == b'S':
+        game_world.main_player.adjust_weapon("counter clockwise")
+    
+    #Rotate weapon right (F)
+    if key == b'f' or key == b'F':
+        game_world.main_player.adjust_weapon("clockwise")
+    
+    #Toggle cheat mode (C)
+    if key == b'c' or key == b'C':
+        game_world.cheat_c_active = not game_world.cheat_c_active
+        print(f"Cheat mode C: {game_world.cheat_c_active}")
+    
+    #Toggle cheat vision (V)
+    if key == b'v' or key == b'V':
+        if game_world.cheat_c_active and game_world.camera_first_person:
+            game_world.cheat_v_active = not game_world.cheat_v_active
+            print(f"Cheat mode V: {game_world.cheat_v_active}")
+    
+    #Reset game (R)
+    if key == b'r' or key == b'R':
+        if game_world.is_game_over:
+            game_world = GameWorld(pooled=game_world.pooled)
+            print("Game reset")
+
+
+def handle_special_keys(key, x, y): #Processes special key inputs for camera adjustment
+
+    global camera_position
+    x, y, z = camera_position
+    
+    #Move camera up (UP arrow)
+    if key == GLUT_KEY_UP:
+        z += 2.0
+
+    #Move camera down (DOWN arrow)
+    if key == GLUT_KEY_DOWN:
+        z -= 2.0
+        z = max(10, z)  # Prevent going below ground
+
+    #Rotate camera left (LEFT arrow)
+    if key == GLUT_KEY_LEFT:
+        x -= 1
+
+    #Rotate camera right (RIGHT arrow)
+    if key == GLUT_KEY_RIGHT:
+        x += 1
+
+    camera_position = (x, y, z)
+
+def handle_mouse(button, state, x, y):    #Processes mouse inputs for shooting and camera mode toggling
+
+    global game_world
+    
+    #Left mouse button shoots
+    if button == GLUT_LEFT_BUTTON and state == GLUT_DOWN:
+        if not game_world.cheat_c_active and not game_world.is_game_over:
+            game_world.fire()
+
+    #Right mouse button toggles camera mode
+    if button == GLUT_RIGHT_BUTTON and state == GLUT_DOWN:
+        game_world.camera_first_person = not game_world.camera_first_person
+        print(f"First person mode: {game_world.camera_first_person}")
+
+
+def configure_camera():  #Sets up the camera's projection and view parameters
+
+    global camera_position, game_world
+    
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    # Set up perspective projection
+    gluPerspective(field_of_view, 1.25, 0.1, 1500)
+    
+    glMatrixMode(GL_MODELVIEW)
+    glLoadIdentity()
+
+    # Extract camera position
+    x, y, z = camera_position
+    
+    if game_world.camera_first_person:
+        # First-person camera from player's viewpoint
+        player_x, player_y, player_z = game_world.main_player.location
+        eye_x = player_x
+        eye_y = player_y
+        eye_z = player_z + 140  # Eye level
+        
+        # Look in weapon direction
+        angle_rad = math.radians(-game_world.main_player.weapon_rotation)
+        center_x = eye_x - math.sin(angle_rad) * 100
+        center_y = eye_y - math.cos(angle_rad) * 100
+        center_z = eye_z
+        
+        gluLookAt(eye_x, eye_y, eye_z, center_x, center_y, center_z, 0, 0, 1)
+    else:
+        # Third-person camera
+        gluLookAt(x, y, z, 0, 0, 0, 0, 0, 1)
+
+
+def idle_processing(dt=None): #Per-frame game update, driven by the frame pacer
+    with profiler.phase("update"):
+        game_world.game_tick()
+
+
+def display_scene():
+
+    # Clear buffers
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    glLoadIdentity()
+    glViewport(0, 0, 1000, 800)
+
+    configure_camera()
+
+    #game elements
+    with profiler.phase("arena"):
+        draw_play_area()
+    with profiler.phase("actors"):
+        game_world.main_player.render()
+        game_world.render_entities()
+    
+    #display game information
+    with profiler.phase("hud"):
+        begin_text()
+        render_text(10, 770, f"Score: {game_world.points}")
+        render_text(10, 740, f"Health: {game_world.main_player.health}")
+        render_text(10, 710, f"Missed Shots: {game_world.main_player.missed_shots}")
+        
+        if game_world.is_game_over:
+            render_text(400, 400, "GAME OVER - Press R to restart", GLUT_BITMAP_TIMES_ROMAN_24)
+        end_text()
+    profiler.draw_overlay(WINDOW_WIDTH, WINDOW_HEIGHT)
+
+    # Swap buffers
+    with profiler.phase("swap"):
+        glutSwapBuffers()
+    profiler.end_frame()
+
+
+def check_collision_paths(ticks=600, bullets=2000, enemies=300, seed=423):
+    #Runs the same stress scenario through both collision paths; returns True when they agree
+    outcomes = []
+    for hashed in (False, True):
+        random.seed(seed)
+        world = GameWorld(pooled=False)
+        world.use_spatial_hash = hashed
+        world.enemy_list = [EnemyCreature() for _ in range(enemies)]
+        for _ in range(bullets):
+            world.main_player.weapon_rotation = random.uniform(0, 360)
+            bullet = world.main_player.shoot()
+            bullet.position[0] += random.uniform(-grid_size, grid_size) * 0.8
+            bullet.position[1] += random.uniform(-grid_size, grid_size) * 0.8
+            world.bullet_list.append(bullet)
+        for _ in range(ticks):
+            world.game_tick()
+            world.is_game_over = False
+        outcomes.append((world.points,
+                         [tuple(b.position) for b in world.bullet_list],
+                         [tuple(e.position) for e in world.enemy_list]))
+    return outcomes[0] == outcomes[1]
+
+
+# Main application entry point
+def main():
+    glutInit()
+    glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
+    glutInitWindowSize(1000, 800)
+    glutInitWindowPosition(0, 0)
+    window = glutCreateWindow(b"3D OpenGL Game")
+    pacer = FramePacer(idle_processing, TARGET_FPS, is_idle=lambda: game_world.is_game_over,
+                       report="--fps" in sys.argv)
+    glutDisplayFunc(pacer.wrap_display(display_scene))
+    glutKeyboardFunc(pacer.wrap_input(handle_keyboard))
+    glutSpecialFunc(pacer.wrap_input(handle_special_keys))
+    glutMouseFunc(pacer.wrap_input(handle_mouse))
+    pacer.start()
+    try:
+        glutCloseFunc(release_gl)  # free cached quadrics/display lists/glyph atlases with the window
+    except:
+        pass
+    glutMainLoop()
+
+if __name__ == "__main__":
+    if "--check-collisions" in sys.argv:
+        same = check_collision_paths()
+        print("Spatial hash matches brute force" if same else "Spatial hash and brute force disagree")
+        sys.exit(0 if same else 1)
     main()
\ No newline at end of file
@@ -0,0 +1,162 @@
+# Render-throughput benchmark for every scene, offscreen (no window needed)
+#
+#   python benchmark.py [--frames N] [--scene NAME ...] [--json out.json] [--no-golden]
+#
+# After timing, the same scenes are checked against their golden frames (golden_frames.py)
+# so a speedup that changes the picture fails the run.
+#
+# The GL backend comes from CSE423_GL_BACKEND (see offscreen.py); the default, Mesa
+# surfaceless EGL, runs on CPU-only machines. Under EGL, GLUT's shapes are drawn by
+# GLU equivalents and bitmap text is skipped, so numbers compare against EGL runs only.
+
+import offscreen   # first: picks PyOpenGL's platform before any other OpenGL import
+
+import sys, io, time, json, random, contextlib
+import numpy as np
+from OpenGL.GL import glFinish
+
+import mesh_cache, bitmap_text, frame_profiler
+
+
+# Each scene factory resets its module's state from `seed`, so the same seed always
+# renders the same frames (golden_frames.py relies on this).
+
+def scene_a1_rain(seed=423):
+    import CSE423_Neha_A1 as a1
+    random.seed(seed)
+    a1.rain_rng = np.random.default_rng(seed)
+    a1.rain_angle = 0
+    a1.init_rain()
+    def frame():
+        a1.update_rain()
+        a1.display_rain()
+    return a1, (a1.rain_w_width, a1.rain_w_height), frame
+
+def scene_a1_box(seed=423):
+    import CSE423_Neha_A1 as a1
+    random.seed(seed)
+    a1.dots.clear()
+    a1.init()
+    for _ in range(300):
+        a1.create_dots(random.uniform(-300, 300), random.uniform(-300, 300))
+    def frame():
+        a1.update_particles()
+        a1.display()
+    return a1, (a1.w_width, a1.w_height), frame
+
+def scene_a2(seed=423, software=False, max_diamonds=0):
+    import CSE423_Neha_A2 as a2
+    random.seed(seed)
+    game = a2.DiamondGame(offscreen=True, software=software, max_diamonds=max_diamonds)
+    for _ in range(max_diamonds):   # start from a full field instead of waiting on the spawn timer
+        game.field.spawn(random.randint(30, game.width - 30), random.uniform(250, game.height - 30), 30,
+                         random.uniform(40, 100), (random.random(), random.random(), random.random()))
+    def frame():
+        if game.diamond:
+            game.catcher.x = game.diamond.x   # autopilot: keep catching so the game keeps going
+        with contextlib.redirect_stdout(io.StringIO()):   # no "Caught!" lines in the report
+            game.update(1/60.0)
+        game.display()
+    return a2, (game.width, game.height), frame
+
+def scene_a2_software(seed=423):
+    # same game through the numpy framebuffer, blitted with one glDrawPixels
+    return scene_a2(seed, software=True)
+
+def scene_a2_multi(seed=423):
+    # several hundred diamonds at once: DiamondField arrays + rasterize_lines
+    return scene_a2(seed, max_diamonds=400)
+
+def scene_a3(seed=423):
+    import CSE423_Neha_A3 as a3
+    random.seed(seed)
+    a3.game_world = a3.GameWorld()
+    count = [0]
+    def frame():
+        count[0] += 1
+        if count[0] % 8 == 0 and not a3.game_world.is_game_over:
+            a3.game_world.fire()
+        a3.idle_processing()
+        a3.display_scene()
+    return a3, (a3.WINDOW_WIDTH, a3.WINDOW_HEIGHT), frame
+
+def scene_surf(seed=423):
+    import CSE423_Neha_Project as surf
+    clock = surf.SimClock()
+    game = surf.Game(clock=clock, rng=random.Random(seed))
+    game.weather_fx = surf.WeatherParticles(game.w, game.h, seed=seed)
+    game.state = surf.PLAYING
+    def frame():
+        game.tick(1/60.0)
+        clock.advance(1/60.0)
+        game.draw(clock())
+    return surf, (game.w, game.h), frame
+
+SCENES = {
+    "a1_rain": scene_a1_rain,
+    "a1_box": scene_a1_box,
+    "a2_diamond": scene_a2,
+    "a2_software": scene_a2_software,
+    "a2_multi": scene_a2_multi,
+    "a3_shooter": scene_a3,
+    "surf": scene_surf,
+}
+
+
+def prepare(modules, counter):
+    if offscreen.BACKEND == "egl":
+        offscreen.install_glut_standins(*modules)
+    counter.install(*modules)
+
+def run_scene(name, frames, counter, warmup=5):
+    with offscreen.SceneState():
+        module, (w, h), frame = SCENES[name]()
+        prepare([module], counter)
+        target = offscreen.Framebuffer(w, h)
+        target.bind()
+        for _ in range(warmup):   # display lists, atlases and buffers get built here
+            frame()
+        glFinish()
+
+        counter.reset()
+        started = time.perf_counter()
+        for _ in range(frames):
+            frame()
+        glFinish()
+        elapsed = time.perf_counter() - started
+        calls = dict(counter.counts)
+        target.release()
+    return {"scene": name, "size": [w, h], "frames": frames, "fps": frames / elapsed,
+            "ms_per_frame": elapsed * 1000.0 / frames,
+            "draw_calls_per_frame": sum(calls.values()) / frames,
+            "calls_per_frame": {k: v / frames for k, v in sorted(calls.items())}}
+
+
+def main(argv):
+    frames = int(argv[argv.index("--frames") + 1]) if "--frames" in argv else 120
+    names = [a for a in argv[1:] if a in SCENES] or list(SCENES)
+    renderer = offscreen.create_context()
+    print(f"backend: {offscreen.BACKEND} ({renderer})")
+
+    counter = offscreen.DrawCallCounter()
+    prepare([mesh_cache, bitmap_text, frame_profiler], counter)
+    results = []
+    for name in names:
+        r = run_scene(name, frames, counter)
+        results.append(r)
+        top = ", ".join(f"{k} {v:.0f}" for k, v in sorted(r["calls_per_frame"].items(), key=lambda kv: -kv[1])[:4])
+        print(f"{name:<12} {r['fps']:8.1f} fps {r['ms_per_frame']:8.2f} ms/frame "
+              f"{r['draw_calls_per_frame']:8.1f} draw calls/frame  ({top})")
+
+    if "--json" in argv:
+        with open(argv[argv.index("--json") + 1], "w") as f:
+            json.dump({"backend": offscreen.BACKEND, "renderer": renderer, "results": results}, f, indent=2)
+
+    if "--no-golden" in argv:
+        return 0
+    import golden_frames
+    return 1 if golden_frames.check(names, counter) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
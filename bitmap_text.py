@@ -0,0 +1,189 @@
+# Cached GLUT bitmap text for the HUDs (A3 shooter, Endless Surf)
+
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from OpenGL.GLUT import *
+
+FIRST_CHAR, LAST_CHAR = 32, 126      # printable ASCII baked into each atlas
+CELL = 32                            # glyph cell size in atlas pixels
+BASELINE = 8                         # baseline height inside a cell
+COLUMNS = 16
+CACHE_LIMIT = 4096                   # cached strings per table; counters like distance keep changing
+
+widths = {}
+
+def font_key(font):
+    # PyOpenGL's GLUT fonts are ctypes pointers, which are not hashable
+    return getattr(font, "value", font)
+
+def text_width(s, font=GLUT_BITMAP_HELVETICA_18):
+    """Pixel width of s in font, measured once per (string, font)."""
+    key = (s, font_key(font))
+    w = widths.get(key)
+    if w is None:
+        w = sum(glutBitmapWidth(font, ord(ch)) for ch in s)
+        if len(widths) >= CACHE_LIMIT:
+            widths.clear()
+        widths[key] = w
+    return w
+
+
+class GlyphAtlas:
+    """One font's printable glyphs rendered by GLUT into a texture through an FBO."""
+
+    def __init__(self, font):
+        self.font = font
+        count = LAST_CHAR - FIRST_CHAR + 1
+        rows = (count + COLUMNS - 1) // COLUMNS
+        self.tex_w, self.tex_h = COLUMNS*CELL, rows*CELL
+        self.advance = np.array([glutBitmapWidth(font, c) for c in range(FIRST_CHAR, LAST_CHAR + 1)],
+                                dtype=np.float32)
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, self.tex_w, self.tex_h, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        self.bake()
+
+    def cell_origin(self, index):
+        return (index % COLUMNS)*CELL, (index // COLUMNS)*CELL
+
+    def bake(self):
+        # draw every glyph in white on a transparent target; the texture alpha is the glyph mask
+        previous = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        fbo = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.texture, 0)
+        glPushAttrib(GL_ALL_ATTRIB_BITS)
+        glDisable(GL_DEPTH_TEST); glDisable(GL_LIGHTING); glDisable(GL_TEXTURE_2D); glDisable(GL_BLEND)
+        glViewport(0, 0, self.tex_w, self.tex_h)
+        glClearColor(0, 0, 0, 0)
+        glClear(GL_COLOR_BUFFER_BIT)
+        glMatrixMode(GL_PROJECTION); glPushMatrix(); glLoadIdentity()
+        gluOrtho2D(0, self.tex_w, 0, self.tex_h)
+        glMatrixMode(GL_MODELVIEW); glPushMatrix(); glLoadIdentity()
+        glColor4f(1, 1, 1, 1)
+        for i in range(LAST_CHAR - FIRST_CHAR + 1):
+            cx, cy = self.cell_origin(i)
+            glRasterPos2i(cx + 4, cy + BASELINE)
+            glutBitmapCharacter(self.font, FIRST_CHAR + i)
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION); glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPopAttrib()
+        glBindFramebuffer(GL_FRAMEBUFFER, previous)
+        glDeleteFramebuffers(1, [fbo])
+
+    def layout(self, s):
+        """Quad corners (relative to the pen start) and texcoords for s, as (4n, 2) arrays."""
+        codes = np.frombuffer(s.encode('ascii', 'replace'), dtype=np.uint8).astype(np.int64)
+        index = np.clip(codes, FIRST_CHAR, LAST_CHAR) - FIRST_CHAR
+        pen = np.concatenate(([0.0], np.cumsum(self.advance[index])[:-1]))
+        x0 = pen - 4
+        y0 = np.full_like(x0, -BASELINE)
+        corners = np.array([(0, 0), (CELL, 0), (CELL, CELL), (0, CELL)], dtype=np.float32)
+        quads = np.stack((x0, y0), axis=1)[:, None, :] + corners[None, :, :]
+        cx = (index % COLUMNS)*CELL
+        cy = (index // COLUMNS)*CELL
+        uv = (np.stack((cx, cy), axis=1)[:, None, :] + corners[None, :, :]) / (self.tex_w, self.tex_h)
+        return quads.reshape(-1, 2).astype(np.float32), uv.reshape(-1, 2).astype(np.float32)
+
+
+class TextBatch:
+    """Collects the strings of one 2D block and draws them as textured quads in one call per font.
+
+    Layouts are cached per (string, font), so a repeated HUD line costs one array copy.
+    Without FBO support the batch falls back to glutBitmapCharacter per glyph.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.active = False
+        self.atlases = {}
+        self.layouts = {}
+        self.pending = []
+
+    def supported(self):
+        return bool(glGenFramebuffers)
+
+    def begin(self):
+        self.active = self.enabled and self.supported()
+
+    def add(self, x, y, s, color, font):
+        self.pending.append((int(x), int(y), s, color, font))
+
+    def atlas(self, font):
+        a = self.atlases.get(font_key(font))
+        if a is None:
+            a = GlyphAtlas(font)
+            self.atlases[font_key(font)] = a
+        return a
+
+    def layout(self, s, font):
+        key = (s, font_key(font))
+        quad = self.layouts.get(key)
+        if quad is None:
+            quad = self.atlas(font).layout(s)
+            if len(self.layouts) >= CACHE_LIMIT:
+                self.layouts.clear()
+            self.layouts[key] = quad
+        return quad
+
+    def flush(self):
+        self.active = False
+        if not self.pending:
+            return
+        by_font = {}
+        for (x, y, s, color, font) in self.pending:
+            if s:
+                by_font.setdefault(font_key(font), (font, []))[1].append((x, y, s, color))
+        self.pending = []
+
+        glPushAttrib(GL_ENABLE_BIT | GL_TEXTURE_BIT | GL_COLOR_BUFFER_BIT | GL_CURRENT_BIT)
+        glPushClientAttrib(GL_CLIENT_VERTEX_ARRAY_BIT)
+        glEnable(GL_TEXTURE_2D)
+        glEnable(GL_BLEND)
+        # alpha is accumulated too, so text baked into an offscreen HUD layer stays premultiplied
+        glBlendFuncSeparate(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+        glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_MODULATE)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        for font, items in by_font.values():
+            quads, uvs, colors = [], [], []
+            for (x, y, s, color) in items:
+                q, uv = self.layout(s, font)
+                quads.append(q + (x, y))
+                uvs.append(uv)
+                colors.append(np.broadcast_to(np.array(color, dtype=np.float32), (len(q), 3)))
+            vertices = np.concatenate(quads)
+            texcoords = np.concatenate(uvs)
+            rgb = np.ascontiguousarray(np.concatenate(colors))
+            glBindTexture(GL_TEXTURE_2D, self.atlas(font).texture)
+            glVertexPointer(2, GL_FLOAT, 0, vertices)
+            glTexCoordPointer(2, GL_FLOAT, 0, texcoords)
+            glColorPointer(3, GL_FLOAT, 0, rgb)
+            glDrawArrays(GL_QUADS, 0, len(vertices))
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glPopClientAttrib()
+        glPopAttrib()
+
+    def draw(self, x, y, s, color=(1, 1, 1), font=GLUT_BITMAP_HELVETICA_18):
+        if self.active:
+            self.add(x, y, s, color, font)
+            return
+        glColor3f(*color)
+        glRasterPos2f(x, y)
+        for ch in s:
+            glutBitmapCharacter(font, ord(ch))
+
+    def release(self):
+        for a in self.atlases.values():
+            glDeleteTextures(1, [a.texture])
+        self.atlases.clear()
+        self.layouts.clear()
+
+
+text = TextBatch()
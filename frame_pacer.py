@@ -0,0 +1,143 @@
+# Frame pacing for the GLUT loops: fixed-step simulation and frame-rate caps
+
+import time
+from OpenGL.GLUT import *
+
+
+class FixedStepScheduler:
+    """Runs update(dt) at a fixed tick rate from accumulated real time.
+
+    advance() runs however many ticks are owed (at most max_catch_up per call; a larger
+    backlog is dropped so a stall never turns into a spiral) and leaves `alpha`, the
+    fraction of the next tick already elapsed, for render interpolation. wait() sleeps
+    off the rest of the frame when max_fps is set instead of spinning the idle callback.
+    """
+
+    def __init__(self, update, tick_hz=60, max_fps=120, max_catch_up=5,
+                 clock=time.perf_counter, sleep=time.sleep):
+        self.update = update
+        self.dt = 1.0 / tick_hz
+        self.frame_interval = 1.0 / max_fps if max_fps else 0.0
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.sleep = sleep
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.last = None
+        self.next_frame = None
+        self.ticks = 0
+        self.dropped_ticks = 0
+
+    def advance(self):
+        now = self.clock()
+        if self.last is None:
+            self.last = now
+        self.accumulator += now - self.last
+        self.last = now
+
+        steps = 0
+        while self.accumulator >= self.dt and steps < self.max_catch_up:
+            self.update(self.dt)
+            self.accumulator -= self.dt
+            steps += 1
+        if self.accumulator >= self.dt:
+            backlog = int(self.accumulator / self.dt)
+            self.dropped_ticks += backlog
+            self.accumulator -= backlog * self.dt
+        self.ticks += steps
+        self.alpha = self.accumulator / self.dt
+        return steps
+
+    def wait(self):
+        if not self.frame_interval:
+            self.sleep(0)   # still yield the CPU between frames
+            return
+        now = self.clock()
+        if self.next_frame is None:
+            self.next_frame = now
+        if self.next_frame > now:
+            self.sleep(self.next_frame - now)
+            now = self.next_frame
+        self.next_frame = max(self.next_frame + self.frame_interval, now)
+
+
+class FramePacer:
+    """Drives update/redisplay from glutTimerFunc deadlines instead of a busy glutIdleFunc.
+
+    Each tick runs update(dt) with dt measured on perf_counter and re-arms the timer for
+    the next frame deadline, so frames land on a steady grid like vsync. While is_idle()
+    (paused, game over) nothing is updated and a frame is only drawn after invalidate(),
+    which the wrapped input handlers call. Achieved FPS and CPU time per frame are
+    measured over one-second windows.
+    """
+
+    def __init__(self, update, target_fps=60, is_idle=None, idle_poll_fps=10, report=False,
+                 clock=time.perf_counter, cpu_clock=time.process_time):
+        self.update = update
+        self.interval = 1.0 / target_fps
+        self.idle_interval = 1.0 / idle_poll_fps
+        self.is_idle = is_idle or (lambda: False)
+        self.report = report
+        self.clock = clock
+        self.cpu_clock = cpu_clock
+        self.dirty = True
+        self.last = None
+        self.deadline = None
+        self.fps = 0.0
+        self.cpu_ms_per_frame = 0.0
+        self.window_start = None
+        self.window_frames = 0
+        self.window_cpu = 0.0
+
+    def start(self):
+        self.last = self.deadline = self.window_start = self.clock()
+        glutTimerFunc(0, self.on_timer, 0)
+
+    def invalidate(self):
+        self.dirty = False
+        glutPostRedisplay()
+
+    def wrap_input(self, handler):
+        # input can change what is on screen even while idle
+        def on_input(*args):
+            handler(*args)
+            self.invalidate()
+        return on_input
+
+    def wrap_display(self, display):
+        def on_display():
+            cpu = self.cpu_clock()
+            display()
+            self.window_cpu += self.cpu_clock() - cpu
+            self.window_frames += 1
+        return on_display
+
+    def on_timer(self, value):
+        now = self.clock()
+        dt, self.last = now - self.last, now
+        cpu = self.cpu_clock()
+        idle = self.is_idle()
+        if not idle:
+            self.update(dt)
+            self.dirty = True
+        if self.dirty:
+            self.dirty = False
+            glutPostRedisplay()
+        self.window_cpu += self.cpu_clock() - cpu
+        self.measure(now)
+
+        # next deadline on the frame grid; a late frame restarts the grid instead of bursting
+        self.deadline += self.idle_interval if idle else self.interval
+        if self.deadline < now:
+            self.deadline = now
+        glutTimerFunc(max(0, int((self.deadline - self.clock())*1000)), self.on_timer, 0)
+
+    def measure(self, now):
+        elapsed = now - self.window_start
+        if elapsed < 1.0:
+            return
+        self.fps = self.window_frames / elapsed
+        self.cpu_ms_per_frame = self.window_cpu*1000.0 / self.window_frames if self.window_frames else 0.0
+        if self.report:
+            print(f"{self.fps:5.1f} fps, {self.cpu_ms_per_frame:.2f} ms CPU/frame")
+        self.window_start, self.window_frames, self.window_cpu = now, 0, 0.0
@@ -0,0 +1,157 @@
+# Opt-in frame-time profiler shared by the four programs
+#
+#   CSE423_PROFILE=1        time update/draw phases/swap
+#   CSE423_PROFILE=overlay  same, plus an on-screen table of the percentiles
+#   CSE423_PROFILE_OUT=f    write the table to f at exit (.json, anything else is CSV)
+
+import os, time, json, csv, atexit
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from OpenGL.GLUT import *
+
+
+class RingBuffer:
+    """Last `size` samples in a fixed numpy array."""
+
+    def __init__(self, size):
+        self.data = np.zeros(size, dtype=np.float64)
+        self.index = 0
+        self.count = 0
+        self.total = 0
+
+    def add(self, value):
+        self.data[self.index] = value
+        self.index = (self.index + 1) % len(self.data)
+        self.count = min(self.count + 1, len(self.data))
+        self.total += 1
+
+    def values(self):
+        return self.data[:self.count]
+
+
+class NullPhase:
+    # shared no-op context handed out while profiling is off
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_PHASE = NullPhase()
+
+
+class Phase:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, (time.perf_counter() - self.start)*1000.0)
+        return False
+
+
+class FrameProfiler:
+    """Rolling per-phase timings (ms) with p50/p95/p99, near free when disabled."""
+
+    def __init__(self, enabled=None, size=600, out=None, overlay=None):
+        mode = os.environ.get("CSE423_PROFILE", "")
+        self.enabled = (bool(mode) and mode != "0") if enabled is None else enabled
+        self.overlay = (mode == "overlay") if overlay is None else overlay
+        self.out = os.environ.get("CSE423_PROFILE_OUT") if out is None else out
+        self.size = size
+        self.buffers = {}
+        self.last_frame = None
+        self.overlay_lines = []
+        self.overlay_refresh = 0.0
+        if self.enabled and self.out:
+            atexit.register(self.dump, self.out)
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_PHASE
+        return Phase(self, name)
+
+    def wrap(self, name, fn):
+        # time every call of fn under `name`; returns fn untouched when disabled
+        if not self.enabled:
+            return fn
+        def timed(*args, **kwargs):
+            with Phase(self, name):
+                return fn(*args, **kwargs)
+        return timed
+
+    def record(self, name, ms):
+        buf = self.buffers.get(name)
+        if buf is None:
+            buf = RingBuffer(self.size)
+            self.buffers[name] = buf
+        buf.add(ms)
+
+    def end_frame(self):
+        # frame-to-frame interval, recorded as "frame"
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.last_frame is not None:
+            self.record("frame", (now - self.last_frame)*1000.0)
+        self.last_frame = now
+
+    def stats(self):
+        table = {}
+        for name, buf in self.buffers.items():
+            v = buf.values()
+            if len(v) == 0:
+                continue
+            p50, p95, p99 = np.percentile(v, (50, 95, 99))
+            table[name] = {"count": buf.total, "mean_ms": float(v.mean()), "p50_ms": float(p50),
+                           "p95_ms": float(p95), "p99_ms": float(p99), "max_ms": float(v.max())}
+        return table
+
+    def dump(self, path):
+        table = self.stats()
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump(table, f, indent=2)
+            return
+        fields = ["count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["phase"] + fields)
+            for name, row in table.items():
+                writer.writerow([name] + [row[k] for k in fields])
+
+    def report(self):
+        lines = [f"{'phase':<12}{'p50':>8}{'p95':>8}{'p99':>8}  ms"]
+        for name, row in self.stats().items():
+            lines.append(f"{name:<12}{row['p50_ms']:8.2f}{row['p95_ms']:8.2f}{row['p99_ms']:8.2f}")
+        return lines
+
+    def draw_overlay(self, w, h):
+        if not (self.enabled and self.overlay):
+            return
+        now = time.perf_counter()
+        if now >= self.overlay_refresh:   # percentiles are recomputed twice a second
+            self.overlay_lines = self.report()
+            self.overlay_refresh = now + 0.5
+        glPushAttrib(GL_ENABLE_BIT | GL_CURRENT_BIT)
+        glDisable(GL_DEPTH_TEST); glDisable(GL_LIGHTING); glDisable(GL_TEXTURE_2D)
+        glMatrixMode(GL_PROJECTION); glPushMatrix(); glLoadIdentity()
+        gluOrtho2D(0, w, 0, h)
+        glMatrixMode(GL_MODELVIEW); glPushMatrix(); glLoadIdentity()
+        glColor3f(1.0, 1.0, 0.3)
+        for i, line in enumerate(self.overlay_lines):
+            glRasterPos2f(10, h - 20 - 14*i)
+            for ch in line:
+                glutBitmapCharacter(GLUT_BITMAP_8_BY_13, ord(ch))
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION); glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPopAttrib()
+
+
+profiler = FrameProfiler()
@@ -0,0 +1,134 @@
+# Golden-frame regression check: renders fixed frames of every scene from a fixed seed
+# and compares perceptual hashes of the pixels against stored goldens
+#
+#   python golden_frames.py [--scene NAME ...] [--update]
+#
+# Goldens are kept per GL backend in golden_frames.json; a scene/backend with no golden
+# yet is recorded on its first run, --update re-records after an intended visual change.
+# Hashes are compared by Hamming distance, so antialiasing and rounding noise between
+# driver versions pass while a moved, missing or recoloured object does not.
+
+import offscreen   # first: picks PyOpenGL's platform before any other OpenGL import
+
+import os, sys, json, time
+import numpy as np
+
+import mesh_cache, bitmap_text, frame_profiler
+import benchmark
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden_frames.json")
+SEED = 423
+CAPTURE = (1, 15, 30)    # frame numbers hashed per scene
+HASH_SIZE = 16           # 16x16 grid -> 256-bit hashes
+TOLERANCE = 12           # max differing bits per hash
+
+
+def grayscale_grid(pixels, size=HASH_SIZE):
+    """Mean luminance of a size x size block grid over an (h, w, 3) uint8 image."""
+    h, w = pixels.shape[:2]
+    gray = pixels.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    ys = np.linspace(0, h, size + 1).astype(int)
+    xs = np.linspace(0, w, size + 1).astype(int)
+    # block sums from the summed-area table, so any image size works
+    sat = np.zeros((h + 1, w + 1), dtype=np.float64)
+    sat[1:, 1:] = gray.cumsum(0).cumsum(1)
+    sums = sat[ys[1:]][:, xs[1:]] - sat[ys[:-1]][:, xs[1:]] - sat[ys[1:]][:, xs[:-1]] + sat[ys[:-1]][:, xs[:-1]]
+    area = np.outer(np.diff(ys), np.diff(xs))
+    return sums / area
+
+def average_hash(grid):
+    return grid > grid.mean()
+
+def difference_hash(grid):
+    # horizontal gradient signs; wraps the first column onto the last to keep size*size bits
+    return grid > np.roll(grid, -1, axis=1)
+
+def to_hex(bits):
+    return np.packbits(bits.ravel()).tobytes().hex()
+
+def hamming(a, b):
+    x = np.frombuffer(bytes.fromhex(a), dtype=np.uint8) ^ np.frombuffer(bytes.fromhex(b), dtype=np.uint8)
+    return int(np.unpackbits(x).sum())
+
+def frame_hashes(pixels):
+    grid = grayscale_grid(pixels)
+    return {"ahash": to_hex(average_hash(grid)), "dhash": to_hex(difference_hash(grid)),
+            "mean": round(float(pixels.mean()), 2)}
+
+
+def render_scene(name, counter, seed=SEED, capture=CAPTURE):
+    """Hashes of the captured frames of scene `name`, rendered from `seed`."""
+    hashes = []
+    with offscreen.SceneState():
+        module, (w, h), frame = benchmark.SCENES[name](seed)
+        benchmark.prepare([module], counter)
+        target = offscreen.Framebuffer(w, h)
+        target.bind()
+        for i in range(1, max(capture) + 1):
+            frame()
+            if i in capture:
+                hashes.append(frame_hashes(target.read_pixels()))
+        target.release()
+    return hashes
+
+def compare(name, hashes, golden, tolerance=TOLERANCE):
+    """List of failure messages, empty when every captured frame is within tolerance."""
+    failures = []
+    if len(golden) != len(hashes):
+        return [f"{name}: {len(hashes)} frames captured, golden has {len(golden)}"]
+    for number, got, want in zip(CAPTURE, hashes, golden):
+        for kind in ("ahash", "dhash"):
+            d = hamming(got[kind], want[kind])
+            if d > tolerance:
+                failures.append(f"{name} frame {number}: {kind} differs in {d} bits "
+                                f"(mean {got['mean']} vs {want['mean']})")
+    return failures
+
+def load_goldens(path=GOLDEN_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_goldens(goldens, path=GOLDEN_PATH):
+    with open(path, "w") as f:
+        json.dump(goldens, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+def check(names, counter, update=False, path=GOLDEN_PATH):
+    """Render and compare every scene in names; returns the failure messages."""
+    goldens = load_goldens(path)
+    stored = goldens.setdefault(offscreen.BACKEND, {})
+    failures, recorded = [], []
+    for name in names:
+        started = time.perf_counter()
+        hashes = render_scene(name, counter)
+        elapsed = time.perf_counter() - started
+        if update or name not in stored:
+            stored[name] = hashes
+            recorded.append(name)
+            status = "recorded"
+        else:
+            problems = compare(name, hashes, stored[name])
+            failures += problems
+            status = "FAIL" if problems else "ok"
+        print(f"golden {name:<12} {status:<8} {elapsed*1000:7.0f} ms")
+    if recorded:
+        save_goldens(goldens, path)
+    for message in failures:
+        print("  " + message)
+    return failures
+
+
+def main(argv):
+    names = [a for a in argv[1:] if a in benchmark.SCENES] or list(benchmark.SCENES)
+    renderer = offscreen.create_context()
+    print(f"backend: {offscreen.BACKEND} ({renderer})")
+    counter = offscreen.DrawCallCounter()
+    benchmark.prepare([mesh_cache, bitmap_text, frame_profiler], counter)
+    failures = check(names, counter, update="--update" in argv)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,60 @@
+# Shared GL object cache for the 3D scenes (A3 shooter, Endless Surf)
+
+from OpenGL.GL import *
+from OpenGL.GLU import *
+
+
+class MeshCache:
+    """Creates GLU quadrics, display lists and buffers once and reuses them every frame."""
+
+    def __init__(self):
+        self.quadrics = {}
+        self.lists = {}
+        self.buffers = {}
+
+    def quadric(self, name="default"):
+        q = self.quadrics.get(name)
+        if q is None:
+            q = gluNewQuadric()
+            self.quadrics[name] = q
+        return q
+
+    def call(self, name, build, *args):
+        # compile build(*args) into a display list the first time `name` is drawn
+        list_id = self.lists.get(name)
+        if list_id is None:
+            list_id = glGenLists(1)
+            glNewList(list_id, GL_COMPILE)
+            build(*args)
+            glEndList()
+            self.lists[name] = list_id
+        glCallList(list_id)
+
+    def buffer(self, name, data=None, target=GL_ARRAY_BUFFER):
+        # bind buffer object `name`, creating it on first use; passing data (re)uploads it
+        buffer_id = self.buffers.get(name)
+        if buffer_id is None:
+            buffer_id = glGenBuffers(1)
+            self.buffers[name] = buffer_id
+        glBindBuffer(target, buffer_id)
+        if data is not None:
+            glBufferData(target, data.nbytes, data, GL_STATIC_DRAW)
+        return buffer_id
+
+    def object_count(self):
+        # number of live GL objects owned by the cache; constant once every mesh was drawn
+        return len(self.quadrics) + len(self.lists) + len(self.buffers)
+
+    def release(self):
+        for q in self.quadrics.values():
+            gluDeleteQuadric(q)
+        for list_id in self.lists.values():
+            glDeleteLists(list_id, 1)
+        for buffer_id in self.buffers.values():
+            glDeleteBuffers(1, [buffer_id])
+        self.quadrics.clear()
+        self.lists.clear()
+        self.buffers.clear()
+
+
+meshes = MeshCache()
@@ -0,0 +1,214 @@
+# Offscreen GL context + framebuffer for rendering the scenes without a window
+#
+#   CSE423_GL_BACKEND=egl   Mesa surfaceless EGL (no X server; llvmpipe on CPU-only boxes)
+#   CSE423_GL_BACKEND=glut  hidden GLUT window (needs a display, e.g. Xvfb)
+#
+# Import this module before anything else imports OpenGL: the EGL backend has to pick
+# PyOpenGL's platform first.
+
+import os
+
+BACKEND = os.environ.get("CSE423_GL_BACKEND", "egl")
+if BACKEND == "egl":
+    os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+    os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+import ctypes, time
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GLU import *
+
+
+def create_context(backend=BACKEND):
+    """Make a GL context current for the rest of the process."""
+    if backend == "egl":
+        from OpenGL import EGL
+        display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError("eglInitialize failed")
+        attrs = (EGL.EGLint * 7)(EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                                 EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+                                 EGL.EGL_RED_SIZE, 8, EGL.EGL_NONE)
+        config, count = EGL.EGLConfig(), EGL.EGLint()
+        if not EGL.eglChooseConfig(display, attrs, ctypes.pointer(config), 1, ctypes.pointer(count)) or not count.value:
+            raise RuntimeError("no EGL config with desktop GL")
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+        size = (EGL.EGLint * 5)(EGL.EGL_WIDTH, 16, EGL.EGL_HEIGHT, 16, EGL.EGL_NONE)
+        surface = EGL.eglCreatePbufferSurface(display, config, size)
+        if not EGL.eglMakeCurrent(display, surface, surface, context):
+            raise RuntimeError("eglMakeCurrent failed")
+    elif backend == "glut":
+        from OpenGL.GLUT import glutInit, glutInitDisplayMode, glutInitWindowSize, glutCreateWindow, glutHideWindow
+        from OpenGL.GLUT import GLUT_DOUBLE, GLUT_RGB, GLUT_DEPTH
+        glutInit()
+        glutInitDisplayMode(GLUT_DOUBLE | GLUT_RGB | GLUT_DEPTH)
+        glutInitWindowSize(16, 16)
+        glutCreateWindow(b"offscreen")
+        glutHideWindow()
+    else:
+        raise ValueError(f"unknown GL backend {backend!r}")
+    return glGetString(GL_RENDERER).decode()
+
+
+class Framebuffer:
+    """Colour + depth render target that stands in for the window's back buffer."""
+
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.fbo = glGenFramebuffers(1)
+        self.color, self.depth = glGenRenderbuffers(2)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH24_STENCIL8, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.color)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_STENCIL_ATTACHMENT, GL_RENDERBUFFER, self.depth)
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError("offscreen framebuffer incomplete")
+
+    def bind(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glViewport(0, 0, self.width, self.height)
+
+    def read_pixels(self):
+        # (height, width, 3) uint8, top row first like a screenshot
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        data = glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE)
+        return np.frombuffer(data, dtype=np.uint8).reshape(self.height, self.width, 3)[::-1].copy()
+
+    def release(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glDeleteFramebuffers(1, [self.fbo])
+        glDeleteRenderbuffers(2, [self.color, self.depth])
+
+
+class SceneState:
+    """Saves GL state on entry and restores it on exit, and starts from identity matrices,
+    so every scene run in one process sees what a freshly opened window would have."""
+
+    def __enter__(self):
+        glPushAttrib(GL_ALL_ATTRIB_BITS)
+        glPushClientAttrib(GL_CLIENT_ALL_ATTRIB_BITS)
+        for mode in (GL_TEXTURE, GL_PROJECTION, GL_MODELVIEW):
+            glMatrixMode(mode)
+            glLoadIdentity()
+        return self
+
+    def __exit__(self, *exc):
+        glPopClientAttrib()
+        glPopAttrib()
+        return False
+
+
+# ---------------------- GLUT stand-ins (EGL backend) ----------------------
+# Without glutInit, freeglut aborts on its shape/text/timing calls, so scenes rendered
+# through EGL get these instead. Geometry matches GLUT's; bitmap text is not drawn.
+quadric = None
+
+def shared_quadric():
+    global quadric
+    if quadric is None:
+        quadric = gluNewQuadric()
+    return quadric
+
+def solid_sphere(radius, slices, stacks):
+    gluSphere(shared_quadric(), radius, slices, stacks)
+
+def solid_cone(base, height, slices, stacks):
+    # GLUT's cone is closed at the base
+    gluCylinder(shared_quadric(), base, 0.0, height, slices, stacks)
+    glPushMatrix(); glRotatef(180, 1, 0, 0)
+    gluDisk(shared_quadric(), 0.0, base, slices, 1)
+    glPopMatrix()
+
+CUBE_FACES = (((1, 0, 0), ((1, -1, -1), (1, 1, -1), (1, 1, 1), (1, -1, 1))),
+              ((-1, 0, 0), ((-1, -1, 1), (-1, 1, 1), (-1, 1, -1), (-1, -1, -1))),
+              ((0, 1, 0), ((-1, 1, -1), (-1, 1, 1), (1, 1, 1), (1, 1, -1))),
+              ((0, -1, 0), ((-1, -1, 1), (-1, -1, -1), (1, -1, -1), (1, -1, 1))),
+              ((0, 0, 1), ((-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1))),
+              ((0, 0, -1), ((-1, 1, -1), (1, 1, -1), (1, -1, -1), (-1, -1, -1))))
+
+def solid_cube(size):
+    h = size / 2.0
+    glBegin(GL_QUADS)
+    for normal, corners in CUBE_FACES:
+        glNormal3f(*normal)
+        for (x, y, z) in corners:
+            glVertex3f(x*h, y*h, z*h)
+    glEnd()
+
+clock_start = None
+
+def elapsed_ms(what):
+    # glutGet stand-in; only GLUT_ELAPSED_TIME is used by the scenes
+    global clock_start
+    now = time.perf_counter()
+    if clock_start is None:
+        clock_start = now
+    return int((now - clock_start) * 1000)
+
+def no_op(*args):
+    return None
+
+GLUT_STANDINS = {
+    "glutSolidSphere": solid_sphere,
+    "glutSolidCube": solid_cube,
+    "glutSolidCone": solid_cone,
+    "glutGet": elapsed_ms,
+    "glutSwapBuffers": glFlush,
+    "glutPostRedisplay": no_op,
+    "glutBitmapCharacter": no_op,
+    "glutBitmapWidth": lambda font, ch: 9,   # about Helvetica 18's average advance
+}
+
+def install_glut_standins(*modules):
+    for module in modules:
+        for name, fn in GLUT_STANDINS.items():
+            if hasattr(module, name):
+                setattr(module, name, fn)
+
+
+# ---------------------- draw-call counting ----------------------
+DRAW_CALLS = ("glBegin", "glDrawArrays", "glDrawElements", "glCallList", "glDrawPixels",
+              "glutSolidSphere", "glutSolidCube", "glutSolidCone", "glutBitmapCharacter",
+              "gluCylinder", "gluSphere", "gluDisk")
+
+class DrawCallCounter:
+    """Counts draw submissions by wrapping the GL entry points in the given modules' globals."""
+
+    def __init__(self):
+        self.counts = {}
+        self.patched = []
+
+    def install(self, *modules):
+        for module in modules:
+            if any(m is module for m, _, _ in self.patched):
+                continue   # several scenes share a module; count each call once
+            for name in DRAW_CALLS:
+                fn = getattr(module, name, None)
+                if fn is None:
+                    continue
+                self.patched.append((module, name, fn))
+                setattr(module, name, self.counting(name, fn))
+
+    def counting(self, name, fn):
+        def counted(*args, **kwargs):
+            self.counts[name] = self.counts.get(name, 0) + 1
+            return fn(*args, **kwargs)
+        return counted
+
+    def reset(self):
+        self.counts = {}
+
+    def total(self):
+        return sum(self.counts.values())
+
+    def uninstall(self):
+        for module, name, fn in reversed(self.patched):
+            setattr(module, name, fn)
+        self.patched = []